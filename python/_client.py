@@ -1,8 +1,82 @@
 import os
+import time
+import threading
+import functools
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import tzlocal
 import json # Added for better error handling if JSON parsing fails
 
+# Shared keep-alive session so paginated callers reuse one TCP/TLS connection.
+# Transient failures are retried with jittered exponential backoff.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=32,
+    max_retries=Retry(
+        total=3,
+        backoff_factor=1,
+        backoff_jitter=1,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET"],
+        raise_on_status=False, # Let raise_for_status() report the final response
+    ),
+))
+
+class _RateLimiter:
+    """
+    Thread-safe token bucket allowing `max_rate` calls per `time_period` seconds.
+    acquire() blocks until a call is allowed.
+    """
+    def __init__(self, max_rate, time_period=60.0):
+        self.max_rate = max_rate
+        self.time_period = time_period
+        self._tokens = float(max_rate)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                refill = (now - self._updated) * self.max_rate / self.time_period
+                self._tokens = min(self.max_rate, self._tokens + refill)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) * self.time_period / self.max_rate
+            time.sleep(wait)
+
+# Client-side request budget for get_lifelogs. The API's real limit isn't documented; 180/minute
+# is an assumed default, overridable with LIMITLESS_RATE_LIMIT_PER_MINUTE. Requests are paced
+# ~10% under it to absorb clock skew; 429s are still retried with backoff by the shared session.
+DEFAULT_RATE_LIMIT_PER_MINUTE = 180
+RATE_LIMIT_HEADROOM = 0.9
+
+def _rate_limit_per_minute():
+    """Return the assumed API rate limit, from LIMITLESS_RATE_LIMIT_PER_MINUTE if set and valid."""
+    value = os.getenv("LIMITLESS_RATE_LIMIT_PER_MINUTE")
+    if not value:
+        return DEFAULT_RATE_LIMIT_PER_MINUTE
+    try:
+        rate = float(value)
+    except ValueError:
+        rate = 0
+    if rate <= 0:
+        print(f"Ignoring invalid LIMITLESS_RATE_LIMIT_PER_MINUTE={value!r}; using {DEFAULT_RATE_LIMIT_PER_MINUTE}.")
+        return DEFAULT_RATE_LIMIT_PER_MINUTE
+    return rate
+
+API_RATE_LIMIT_PER_MINUTE = _rate_limit_per_minute()
+_RATE_LIMITER = _RateLimiter(max_rate=max(1, int(API_RATE_LIMIT_PER_MINUTE * RATE_LIMIT_HEADROOM)), time_period=60.0)
+
+@functools.lru_cache(maxsize=1)
+def _local_timezone():
+    """Return the local timezone name; it doesn't change during a run, so it is read from disk only once."""
+    return str(tzlocal.get_localzone())
+
 def get_lifelogs(api_key,
                  api_url=os.getenv("LIMITLESS_API_URL") or "https://api.limitless.ai",
                  endpoint="v1/lifelogs",
@@ -29,7 +103,7 @@ def get_lifelogs(api_key,
         "includeMarkdown": "true" if includeMarkdown else "false",
         "includeHeadings": "true" if includeHeadings else "false",
         "direction": direction,
-        "timezone": timezone if timezone else str(tzlocal.get_localzone())
+        "timezone": timezone if timezone else _local_timezone()
     }
 
     if date:
@@ -42,7 +116,8 @@ def get_lifelogs(api_key,
     print(f"[DEBUG] Making API call to {api_url}/{endpoint} with params: {params}")
 
     try:
-        response = requests.get(
+        _RATE_LIMITER.acquire()
+        response = _SESSION.get(
             f"{api_url}/{endpoint}",
             headers={"X-API-Key": api_key},
             params=params,
@@ -0,0 +1,122 @@
+"""
+Session span extraction shared by analyze_daily_usage.py and analyze_monthly_usage.py.
+
+A session span is one lifelog's first timestamped segment start to its last timestamped
+segment end, parsed from the contents JSON exported by export_day_contents_json.py.
+"""
+import pandas as pd
+
+try:
+    import ciso8601 # C ISO 8601 parser, faster than pandas' own string parsing
+except ImportError:
+    ciso8601 = None
+
+HEADING_TYPES = frozenset({'heading1', 'heading2', 'heading3'}) # Segment types that never mark recording time
+UNPARSEABLE_WARNING = "Warning: Could not parse timestamps for log entry ID {log_id}." # Default per-span warning
+
+def _ciso_parse(iso_string):
+    """Parses one ISO timestamp with ciso8601, returning None if it is missing or malformed."""
+    if not iso_string:
+        return None
+    try:
+        return ciso8601.parse_datetime(iso_string)
+    except ValueError:
+        return None
+
+def parse_timestamps(iso_strings):
+    """
+    Parses a list of ISO timestamp strings in one vectorized call, keeping their UTC offset.
+    Missing or unparseable entries become NaT. If the strings mix UTC offsets (e.g. across a
+    DST change), everything is expressed in the offset of the first parseable timestamp.
+    With ciso8601 installed each string is parsed in C first and pandas only boxes the results.
+    """
+    values = [_ciso_parse(s) for s in iso_strings] if ciso8601 else iso_strings
+    try:
+        return pd.to_datetime(pd.Series(values, dtype=object), format='ISO8601', cache=True)
+    except (ValueError, TypeError):
+        parsed = pd.to_datetime(pd.Series(values, dtype=object), format='ISO8601', utc=True, errors='coerce', cache=True)
+        first_valid = parsed.first_valid_index()
+        if first_valid is None:
+            return parsed
+        return parsed.dt.tz_convert(pd.Timestamp(values[first_valid]).tz)
+
+def parse_timestamps_like(iso_strings, like):
+    """
+    Parses ISO timestamp strings into the same timezone as the `like` column, so the result can
+    be compared and combined with it. Missing, unparseable or incompatible (naive vs offset)
+    entries become NaT.
+    """
+    values = [_ciso_parse(s) for s in iso_strings] if ciso8601 else iso_strings
+    series = pd.Series(values, dtype=object)
+    tz = like.dt.tz
+    if tz is not None:
+        return pd.to_datetime(series, format='ISO8601', utc=True, errors='coerce', cache=True).dt.tz_convert(tz)
+    try:
+        parsed = pd.to_datetime(series, format='ISO8601', errors='coerce', cache=True)
+    except (ValueError, TypeError): # Naive and offset-bearing strings mixed together
+        parsed = None
+    if parsed is None or parsed.dt.tz is not None:
+        return pd.Series(pd.NaT, index=like.index, dtype=like.dtype)
+    return parsed
+
+def iter_span_strings(lifelogs):
+    """
+    Projects each lifelog down to the raw strings a session span needs, skipping logs without
+    timestamped segments. Works on any iterable, so lifelogs can be streamed in.
+
+    Yields:
+        tuple: (log_id, first_start_str, last_end_str, first_end_str)
+    """
+    for log_entry in lifelogs:
+        contents = log_entry.get('contents')
+
+        if not contents or not isinstance(contents, list) or len(contents) == 0:
+            continue
+
+        # Only the first and last timestamped segments matter, so scan in from each end
+        first_segment_with_time = next((seg for seg in contents if isinstance(seg, dict) and 'startTime' in seg and seg.get('type') not in HEADING_TYPES), None)
+        if first_segment_with_time is None:
+            continue
+        last_segment_with_time = next(seg for seg in reversed(contents) if isinstance(seg, dict) and 'startTime' in seg and seg.get('type') not in HEADING_TYPES)
+
+        yield (log_entry.get('lifelog_id', 'N/A'),
+               first_segment_with_time['startTime'],
+               last_segment_with_time.get('endTime') or last_segment_with_time['startTime'],
+               first_segment_with_time.get('endTime') or None)
+
+def spans_from_strings(span_strings, warning_template=UNPARSEABLE_WARNING):
+    """
+    Builds the session spans DataFrame from iter_span_strings tuples, parsing each timestamp
+    column with a single vectorized call. Spans whose timestamps cannot be parsed are dropped,
+    printing warning_template (formatted with log_id) for each.
+    """
+    if not span_strings:
+        return pd.DataFrame()
+    log_ids, first_strs, last_strs, first_end_strs = zip(*span_strings)
+
+    first_ts = parse_timestamps(first_strs)
+    last_ts_of_span = parse_timestamps(last_strs)
+
+    unparseable = first_ts.isna() | last_ts_of_span.isna()
+    has_unparseable = unparseable.any()
+    if has_unparseable:
+        for log_id in pd.Series(log_ids)[unparseable]:
+            print(warning_template.format(log_id=log_id))
+
+    # If a span ends before it starts, fall back to the first segment's own end time
+    # (when present and sane), or else a one-second span
+    backwards = last_ts_of_span < first_ts
+    if backwards.any():
+        first_end_ts = parse_timestamps_like(first_end_strs, first_ts)
+        one_second_span = first_ts + pd.Timedelta(seconds=1)
+        replacement = first_end_ts.where(first_end_ts.notna() & (first_end_ts >= first_ts), one_second_span)
+        last_ts_of_span = last_ts_of_span.where(~backwards, replacement)
+
+    # The two parsed columns are already typed arrays, so wrap them without copying
+    session_spans = pd.DataFrame({
+        'first_timestamp': first_ts,
+        'last_timestamp_of_span': last_ts_of_span
+    }, copy=False)
+    if has_unparseable:
+        return session_spans[~unparseable].reset_index(drop=True)
+    return session_spans # Common case: every span parsed, so skip the boolean-mask copy
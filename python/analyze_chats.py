@@ -10,19 +10,37 @@ This script fetches all available chats and analyzes them to discover:
 - Message characteristics
 
 Usage:
-    python analyze_chats.py [--save-raw] [--max-pages N]
+    python analyze_chats.py [--save-raw [--raw-format json|ndjson]] [--max-pages N] [--page-limit N] [--workers N]
 """
 
 import os
 import sys
 import json
+import codecs
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import argparse
-from datetime import datetime
+from dataclasses import dataclass
+from datetime import datetime, date
 from pathlib import Path
 from dotenv import load_dotenv
 from collections import Counter, defaultdict
 import time
+import queue
+import threading
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import orjson  # Faster JSON parsing for large chat pages
+except ImportError:
+    orjson = None
+
+try:
+    import ciso8601  # Fast C parser for ISO 8601 timestamps
+except ImportError:
+    ciso8601 = None
 
 # Load environment variables
 env_path = Path(__file__).parent.parent / '.env'
@@ -34,20 +52,101 @@ else:
 API_KEY = os.getenv("LIMITLESS_API_KEY")
 API_URL = os.getenv("LIMITLESS_API_URL", "https://api.limitless.ai")
 MAX_RETRIES = 3
-RETRY_DELAY = 5
-REQUEST_DELAY = 0.5
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+BACKOFF_BASE = 1.0  # Seconds; doubled on each retry
+BACKOFF_CAP = 30.0  # Upper bound for a single backoff sleep
+RATE_LIMIT_THRESHOLD = 1  # Pause until reset when fewer requests remain
+PREFETCH_PAGES = 2  # Pages fetched ahead of the consumer
+DEFAULT_PAGE_LIMIT = 100  # Chats requested per page
+FALLBACK_PAGE_LIMIT = 10  # Used if the API rejects the larger page size
+METADATA_BATCH_SIZE = 1024  # Chats handed to the process pool at a time
+_FROMISOFORMAT_HANDLES_Z = sys.version_info >= (3, 11)  # Accepts a trailing 'Z'
+
+# Shared keep-alive session; transient failures (connection errors and the
+# status codes above) are retried by urllib3 with jittered exponential
+# backoff, honouring Retry-After on 429/503.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=32,
+    max_retries=Retry(
+        total=MAX_RETRIES,
+        backoff_factor=BACKOFF_BASE,
+        backoff_max=BACKOFF_CAP,
+        backoff_jitter=BACKOFF_BASE,
+        status_forcelist=sorted(RETRYABLE_STATUS_CODES),
+        allowed_methods=["GET"],
+        raise_on_status=False,
+    ),
+))
+
+
+def _respect_rate_limit(response):
+    """
+    Sleep until the rate limit window resets if the API reports that we are
+    about to run out of requests.
+    """
+    remaining = response.headers.get("X-RateLimit-Remaining")
+    reset = response.headers.get("X-RateLimit-Reset")
+    if remaining is None or reset is None:
+        return
+
+    try:
+        remaining = int(remaining)
+        reset = float(reset)
+    except ValueError:
+        return
+
+    if remaining >= RATE_LIMIT_THRESHOLD:
+        return
+
+    # The reset value may be an epoch timestamp or a number of seconds
+    wait = reset - time.time() if reset > 1_000_000_000 else reset
+    if wait > 0:
+        print(f"  Rate limit nearly exhausted, waiting {wait:.1f} seconds...")
+        time.sleep(min(wait, BACKOFF_CAP))
 
 
-def fetch_all_chats(max_pages=200):
+def _fetch_chats_page(endpoint, headers, params):
     """
-    Fetch all available chats from the API.
+    Fetch a single page of chats.
+
+    Transient failures are retried by the session's adapter, so any error
+    raised here is final.
 
     Returns:
-        list: List of all chat objects
+        tuple: (parsed JSON response, response object). On failure the data
+            is None and the response is the error response, if there was one
+    """
+    try:
+        response = _SESSION.get(endpoint, headers=headers, params=params, timeout=30)
+        response.raise_for_status()
+        data = orjson.loads(response.content) if orjson else response.json()
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"  Request failed: {e}")
+        return None, getattr(e, "response", None)
+
+    return data, response
+
+
+def iter_chat_pages(max_pages=200, page_limit=DEFAULT_PAGE_LIMIT):
+    """
+    Yield pages of chats from the API.
+
+    Pages are fetched on a background thread and handed over through a small
+    queue. Each page is handed over as soon as it is parsed and the request
+    for the next page goes out right after, so it is already in flight while
+    the caller processes the current one.
+
+    If the API rejects page_limit with a 400, the fetch falls back to
+    FALLBACK_PAGE_LIMIT chats per page.
+
+    Yields:
+        list: Chat objects from one API page
     """
     if not API_KEY:
         print("Error: LIMITLESS_API_KEY not found in environment variables.")
-        return []
+        return
 
     endpoint = f"{API_URL}/v1/chats"
     headers = {
@@ -55,59 +154,148 @@ def fetch_all_chats(max_pages=200):
         "Accept": "application/json"
     }
 
-    all_chats = []
-    cursor = None
-    pages_fetched = 0
-
-    print("Fetching all chats from the API...")
-    print(f"{'='*60}\n")
-
-    while pages_fetched < max_pages:
-        params = {
-            "limit": 10,
-            "includeMarkdown": "true"
-        }
-
-        if cursor:
-            params["cursor"] = cursor
-
-        # Make API request with retries
-        for attempt in range(MAX_RETRIES):
-            try:
-                response = requests.get(endpoint, headers=headers, params=params, timeout=30)
-                response.raise_for_status()
-                data = response.json()
-                break
-            except requests.exceptions.RequestException as e:
-                if attempt < MAX_RETRIES - 1:
-                    print(f"  Request failed (attempt {attempt + 1}/{MAX_RETRIES}): {e}")
-                    print(f"  Retrying in {RETRY_DELAY} seconds...")
-                    time.sleep(RETRY_DELAY)
-                else:
-                    print(f"  Failed after {MAX_RETRIES} attempts: {e}")
-                    return all_chats
+    pages = queue.Queue(maxsize=PREFETCH_PAGES)
 
-        # Add all chats from this page
-        chats = data.get("data", {}).get("chats", [])
-        all_chats.extend(chats)
+    def produce_pages():
+        limit = page_limit
+        cursor = None
+        pages_fetched = 0
+        try:
+            while pages_fetched < max_pages:
+                params = {
+                    "limit": limit,
+                    "includeMarkdown": "true"
+                }
+
+                if cursor:
+                    params["cursor"] = cursor
+
+                data, response = _fetch_chats_page(endpoint, headers, params)
+                if (data is None and response is not None and response.status_code == 400
+                        and limit > FALLBACK_PAGE_LIMIT):
+                    print(f"  Page size {limit} rejected, falling back to {FALLBACK_PAGE_LIMIT}...")
+                    limit = FALLBACK_PAGE_LIMIT
+                    continue
+                if data is None:
+                    break
+
+                pages_fetched += 1
+                next_cursor = data.get("meta", {}).get("chats", {}).get("nextCursor")
+                pages.put((data.get("data", {}).get("chats", []), next_cursor))
+
+                if not next_cursor:
+                    break
+
+                # Only throttle once the current page is with the consumer,
+                # and never after the last page
+                _respect_rate_limit(response)
+                cursor = next_cursor
+        finally:
+            pages.put(None)
+
+    producer = threading.Thread(target=produce_pages, daemon=True)
+    producer.start()
+
+    while True:
+        page = pages.get()
+        if page is None:
+            break
 
-        pages_fetched += 1
-        print(f"  Page {pages_fetched}: {len(all_chats)} total chats fetched...")
+        chats, next_cursor = page
+        yield chats
 
-        # Check for next page
-        next_cursor = data.get("meta", {}).get("chats", {}).get("nextCursor")
         if not next_cursor:
             print(f"\n✅ Reached end of available chats")
-            break
 
-        cursor = next_cursor
-        time.sleep(REQUEST_DELAY)
+    producer.join()
+
+
+def iter_all_chats(max_pages=200, page_limit=DEFAULT_PAGE_LIMIT, raw_path=None, raw_ndjson=False):
+    """
+    Fetch all available chats from the API, yielding them one at a time.
+
+    Chats are not accumulated, so callers that only keep derived metadata
+    never hold the full corpus in memory.
+
+    Args:
+        max_pages: Maximum number of API pages to fetch
+        page_limit: Number of chats to request per page
+        raw_path: Optional path; if given, each chat is also written to this
+            file as it arrives
+        raw_ndjson: Write raw_path as NDJSON (one chat per line) instead of
+            the default indented JSON array
+
+    Yields:
+        dict: Chat objects
+    """
+    total_chats = 0
+    raw_written = 0
+    raw_file = open(raw_path, 'wb') if raw_path else None
+
+    print("Fetching all chats from the API...")
+    print(f"{'='*60}\n")
+
+    try:
+        for pages_fetched, chats in enumerate(iter_chat_pages(max_pages, page_limit), 1):
+            total_chats += len(chats)
+            print(f"  Page {pages_fetched}: {total_chats} total chats fetched...")
+            for chat in chats:
+                if raw_file:
+                    if raw_ndjson:
+                        raw_file.write(_dump_chat(chat))
+                    else:
+                        raw_file.write((b",\n" if raw_written else b"[\n") + _dump_chat_array_item(chat))
+                    raw_written += 1
+                yield chat
+    finally:
+        if raw_file:
+            if not raw_ndjson:
+                # Close the array; matches json.dump(all_chats, f, indent=2), including for no chats
+                raw_file.write(b"\n]" if raw_written else b"[]")
+            raw_file.close()
 
     print(f"\n{'='*60}")
-    print(f"Total chats fetched: {len(all_chats)}")
+    print(f"Total chats fetched: {total_chats}")
     print(f"{'='*60}\n")
 
-    return all_chats
+
+def _parse_timestamp(value):
+    """
+    Parse an ISO 8601 API timestamp.
+
+    Returns:
+        datetime: Parsed timestamp, or None if missing or malformed
+    """
+    if not value:
+        return None
+    if ciso8601:
+        try:
+            return ciso8601.parse_datetime(value)
+        except (ValueError, TypeError):  # TypeError: a non-string value such as a number or dict
+            return None
+    if not _FROMISOFORMAT_HANDLES_Z and isinstance(value, str) and value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    try:
+        return datetime.fromisoformat(value)
+    except (ValueError, TypeError):
+        return None
+
+
+@dataclass(slots=True)
+class ChatMeta:
+    """Per-chat metadata used by the analysis (slotted to keep records small)."""
+    id: str
+    summary: str
+    visibility: str
+    created_at: str
+    created_date: datetime | None
+    created_day: date | None
+    started_at: str
+    message_count: int
+    user_message_count: int
+    assistant_message_count: int
+    first_user_message: str
+    assistant_response_length: int
 
 
 def analyze_chat_metadata(chat):
@@ -115,7 +303,7 @@ def analyze_chat_metadata(chat):
     Extract metadata from a chat for analysis.
 
     Returns:
-        dict: Metadata about the chat
+        ChatMeta: Metadata about the chat
     """
     messages = chat.get("messages", [])
 
@@ -123,49 +311,72 @@ def analyze_chat_metadata(chat):
     created_at = chat.get("createdAt", "")
     started_at = chat.get("startedAt", "")
 
-    created_date = None
-    if created_at:
-        try:
-            created_date = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-        except:
-            pass
+    created_date = _parse_timestamp(created_at)
+    created_day = created_date.date() if created_date else None
 
-    # Analyze messages
-    user_messages = []
-    assistant_messages = []
+    # Count messages per role in one pass, remembering only the first user
+    # and assistant message texts
+    user_message_count = 0
+    assistant_message_count = 0
+    first_user_msg = None
+    first_assistant_msg = None
 
     for msg in messages:
-        user = msg.get("user", {})
-        role = user.get("role", "")
-        text = msg.get("text", "")
-
+        role = (msg.get("user") or {}).get("role", "")
         if role == "user":
-            user_messages.append(text)
+            user_message_count += 1
+            if first_user_msg is None:
+                first_user_msg = msg.get("text", "") or ""
         elif role == "assistant":
-            assistant_messages.append(text)
+            assistant_message_count += 1
+            if first_assistant_msg is None:
+                first_assistant_msg = msg.get("text", "") or ""
 
     # Get first user message (often indicates purpose)
-    first_user_msg = user_messages[0] if user_messages else ""
+    first_user_msg = first_user_msg or ""
 
     # Calculate assistant response length safely
-    assistant_response_length = 0
-    if assistant_messages and assistant_messages[0] is not None:
-        assistant_response_length = len(assistant_messages[0])
+    assistant_response_length = len(first_assistant_msg) if first_assistant_msg else 0
+
+    return ChatMeta(
+        id=chat.get("id", ""),
+        # Low-cardinality labels are interned so repeats share one object
+        summary=sys.intern(chat.get("summary", "") or ""),
+        visibility=sys.intern(chat.get("visibility", "") or ""),
+        created_at=created_at,
+        created_date=created_date,
+        created_day=created_day,
+        started_at=started_at,
+        message_count=len(messages),
+        user_message_count=user_message_count,
+        assistant_message_count=assistant_message_count,
+        # First 200 chars, interned so recurring prompts share one object
+        first_user_message=sys.intern(first_user_msg[:200]),
+        assistant_response_length=assistant_response_length,
+    )
 
-    return {
-        "id": chat.get("id", ""),
-        "summary": chat.get("summary", ""),
-        "visibility": chat.get("visibility", ""),
-        "created_at": created_at,
-        "created_date": created_date,
-        "started_at": started_at,
-        "message_count": len(messages),
-        "user_message_count": len(user_messages),
-        "assistant_message_count": len(assistant_messages),
-        "first_user_message": first_user_msg[:200],  # First 200 chars
-        "first_user_message_full": first_user_msg,
-        "assistant_response_length": assistant_response_length,
-    }
+
+def extract_chats_metadata(chats, workers=1):
+    """
+    Run analyze_chat_metadata over an iterable of chats.
+
+    With workers > 1 the chats are spread over a process pool. They are fed
+    in bounded batches so a streaming source is never fully materialized.
+
+    Returns:
+        list: ChatMeta records in input order
+    """
+    if workers <= 1:
+        return [analyze_chat_metadata(chat) for chat in chats]
+
+    chats_metadata = []
+    chats = iter(chats)
+    # Amortize pickling overhead with a few chunks per worker per batch
+    chunksize = max(1, METADATA_BATCH_SIZE // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while batch := list(itertools.islice(chats, METADATA_BATCH_SIZE)):
+            chats_metadata.extend(executor.map(analyze_chat_metadata, batch, chunksize=chunksize))
+    return chats_metadata
 
 
 def analyze_patterns(chats_metadata):
@@ -175,6 +386,38 @@ def analyze_patterns(chats_metadata):
     Returns:
         dict: Analysis results
     """
+    # Gather every aggregate in a single pass over the metadata; the
+    # counters are bulk-built from plain lists afterwards
+    summary_values = []
+    first_message_values = []
+    visibility_values = []
+    chats_by_date = defaultdict(list)
+    by_summary = defaultdict(list)
+    total_messages = 0
+    total_user_msgs = 0
+    total_assistant_msgs = 0
+    total_response_length = 0
+
+    for m in chats_metadata:
+        summary = m.summary
+        if summary:
+            summary_values.append(summary)
+            by_summary[summary].append(m)
+        if m.first_user_message:
+            first_message_values.append(m.first_user_message)
+        if m.visibility:
+            visibility_values.append(m.visibility)
+        if m.created_date:
+            chats_by_date[m.created_day.isoformat()].append(m)
+        total_messages += m.message_count
+        total_user_msgs += m.user_message_count
+        total_assistant_msgs += m.assistant_message_count
+        total_response_length += m.assistant_response_length
+
+    summaries = Counter(summary_values)
+    first_messages = Counter(first_message_values)
+    visibility = Counter(visibility_values)
+
     print("\n" + "="*60)
     print("CHAT ANALYSIS RESULTS")
     print("="*60 + "\n")
@@ -182,14 +425,12 @@ def analyze_patterns(chats_metadata):
     # 1. Summary analysis
     print("📊 CHAT SUMMARIES (Types/Categories)")
     print("-" * 60)
-    summaries = Counter(m["summary"] for m in chats_metadata if m["summary"])
     for summary, count in summaries.most_common():
         print(f"  {count:3d}x  {summary}")
 
     # 2. First message patterns
     print("\n\n🔍 FIRST USER MESSAGE PATTERNS")
     print("-" * 60)
-    first_messages = Counter(m["first_user_message"] for m in chats_metadata if m["first_user_message"])
     for msg, count in first_messages.most_common(20):
         if count > 1:  # Only show recurring patterns
             print(f"  {count:3d}x  {msg}")
@@ -198,13 +439,6 @@ def analyze_patterns(chats_metadata):
     print("\n\n📅 TEMPORAL PATTERNS")
     print("-" * 60)
 
-    # Group by date
-    chats_by_date = defaultdict(list)
-    for m in chats_metadata:
-        if m["created_date"]:
-            date_str = m["created_date"].date().isoformat()
-            chats_by_date[date_str].append(m)
-
     # Find dates with multiple chats
     multi_chat_dates = {date: chats for date, chats in chats_by_date.items() if len(chats) > 1}
 
@@ -214,16 +448,17 @@ def analyze_patterns(chats_metadata):
             chats = multi_chat_dates[date]
             print(f"\n  {date} ({len(chats)} chats):")
             for chat in chats:
-                print(f"    - {chat['summary'][:50]}")
+                print(f"    - {chat.summary[:50]}")
 
     # 4. Message characteristics
     print("\n\n💬 MESSAGE CHARACTERISTICS")
     print("-" * 60)
 
-    avg_messages = sum(m["message_count"] for m in chats_metadata) / len(chats_metadata)
-    avg_user_msgs = sum(m["user_message_count"] for m in chats_metadata) / len(chats_metadata)
-    avg_assistant_msgs = sum(m["assistant_message_count"] for m in chats_metadata) / len(chats_metadata)
-    avg_response_length = sum(m["assistant_response_length"] for m in chats_metadata) / len(chats_metadata)
+    total_chats = len(chats_metadata)
+    avg_messages = total_messages / total_chats
+    avg_user_msgs = total_user_msgs / total_chats
+    avg_assistant_msgs = total_assistant_msgs / total_chats
+    avg_response_length = total_response_length / total_chats
 
     print(f"  Average messages per chat: {avg_messages:.1f}")
     print(f"  Average user messages: {avg_user_msgs:.1f}")
@@ -234,12 +469,6 @@ def analyze_patterns(chats_metadata):
     print("\n\n🔄 POTENTIAL SERIES/RECURRING PATTERNS")
     print("-" * 60)
 
-    # Group by summary
-    by_summary = defaultdict(list)
-    for m in chats_metadata:
-        if m["summary"]:
-            by_summary[m["summary"]].append(m)
-
     # Find series (summaries with multiple instances)
     series = {summary: chats for summary, chats in by_summary.items() if len(chats) > 1}
 
@@ -248,26 +477,27 @@ def analyze_patterns(chats_metadata):
             print(f"\n  📌 {summary} ({len(chats)} instances)")
 
             # Check if it's a daily pattern
-            dates = [c["created_date"].date() for c in chats if c["created_date"]]
+            dates = [c.created_day for c in chats if c.created_day]
             if len(dates) > 1:
-                dates_sorted = sorted(dates)
-                date_range = f"{dates_sorted[0]} to {dates_sorted[-1]}"
-
-                # Check for daily pattern
-                date_diffs = [(dates_sorted[i+1] - dates_sorted[i]).days for i in range(len(dates_sorted)-1)]
-                if date_diffs:
-                    avg_gap = sum(date_diffs) / len(date_diffs)
-                    if avg_gap <= 1.5:
-                        print(f"     ⭐ DAILY SERIES - appears ~daily")
-                    elif avg_gap <= 7.5:
-                        print(f"     📅 WEEKLY SERIES - appears ~weekly")
-                    else:
-                        print(f"     🔹 OCCASIONAL - avg {avg_gap:.1f} days between")
+                first_date = min(dates)
+                last_date = max(dates)
+                date_range = f"{first_date} to {last_date}"
+
+                # Check for daily pattern. The consecutive gaps of the sorted
+                # dates telescope, so their mean is just the overall span
+                # divided by the number of gaps.
+                avg_gap = (last_date - first_date).days / (len(dates) - 1)
+                if avg_gap <= 1.5:
+                    print(f"     ⭐ DAILY SERIES - appears ~daily")
+                elif avg_gap <= 7.5:
+                    print(f"     📅 WEEKLY SERIES - appears ~weekly")
+                else:
+                    print(f"     🔹 OCCASIONAL - avg {avg_gap:.1f} days between")
 
                 print(f"     Date range: {date_range}")
 
                 # Show first user message pattern
-                first_msgs = set(c["first_user_message"] for c in chats if c["first_user_message"])
+                first_msgs = set(c.first_user_message for c in chats if c.first_user_message)
                 if len(first_msgs) == 1:
                     print(f"     Consistent prompt: \"{list(first_msgs)[0]}\"")
                 else:
@@ -276,18 +506,72 @@ def analyze_patterns(chats_metadata):
     # 6. Visibility analysis
     print("\n\n🔒 VISIBILITY")
     print("-" * 60)
-    visibility = Counter(m["visibility"] for m in chats_metadata if m["visibility"])
     for vis, count in visibility.most_common():
         print(f"  {count:3d}x  {vis}")
 
     return {
-        "total_chats": len(chats_metadata),
+        "total_chats": total_chats,
         "summaries": dict(summaries),
         "series": {k: len(v) for k, v in series.items()},
         "dates_with_multiple_chats": len(multi_chat_dates),
     }
 
 
+def _dump_chat(chat):
+    """
+    Serialize a chat as one NDJSON line.
+
+    Returns:
+        bytes: JSON-encoded chat followed by a newline
+    """
+    if orjson:
+        return orjson.dumps(chat) + b"\n"
+    return json.dumps(chat).encode('utf-8') + b"\n"
+
+
+def _dump_chat_array_item(chat):
+    """
+    Serialize a chat as one element of an indented JSON array.
+
+    Chats are written one at a time, but the file is byte-for-byte what
+    json.dump(all_chats, f, indent=2) produces.
+
+    Returns:
+        bytes: JSON-encoded chat, indented one level, without separators
+    """
+    # Encoded strings never contain raw newlines, so indenting every line is safe
+    return ("  " + json.dumps(chat, indent=2).replace("\n", "\n  ")).encode('utf-8')
+
+
+def iter_raw_chats(input_path):
+    """
+    Read raw chats saved by --save-raw, yielding them one at a time.
+
+    Accepts both the default JSON array and NDJSON (--raw-format ndjson).
+
+    Yields:
+        dict: Chat objects
+    """
+    loads = orjson.loads if orjson else json.loads
+    with open(input_path, 'rb') as f:
+        # Skip a UTF-8 BOM and leading whitespace (e.g. from re-saving in an editor) before
+        # checking whether the file is a JSON array
+        if f.read(len(codecs.BOM_UTF8)) != codecs.BOM_UTF8:
+            f.seek(0)
+        start = f.tell()
+        first = f.read(1)
+        while first.isspace():
+            first = f.read(1)
+        is_array = first == b'['
+        f.seek(start)
+        if is_array:
+            yield from loads(f.read())
+            return
+        for line in f:
+            if line.strip():
+                yield loads(line)
+
+
 def save_detailed_report(chats_metadata, analysis, output_dir):
     """
     Save a detailed JSON report of the analysis.
@@ -298,19 +582,23 @@ def save_detailed_report(chats_metadata, analysis, output_dir):
         "summary": analysis,
         "chats": [
             {
-                "id": m["id"],
-                "summary": m["summary"],
-                "created_at": m["created_at"],
-                "message_count": m["message_count"],
-                "first_user_message": m["first_user_message"],
+                "id": m.id,
+                "summary": m.summary,
+                "created_at": m.created_at,
+                "message_count": m.message_count,
+                "first_user_message": m.first_user_message,
             }
             for m in chats_metadata
         ]
     }
 
     output_path = output_dir / "chats_analysis_report.json"
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(report, f, indent=2)
+    if orjson:
+        with open(output_path, 'wb') as f:
+            f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
 
     print(f"\n\n📄 Detailed report saved to: {output_path}")
     return output_path
@@ -323,11 +611,18 @@ def main():
     parser.add_argument(
         "--save-raw",
         action="store_true",
-        help="Save raw chat data to JSON file"
+        help="Save raw chat data to exports/all_chats_raw.json"
+    )
+    parser.add_argument(
+        "--raw-format",
+        choices=["json", "ndjson"],
+        default="json",
+        help="Format for --save-raw: a JSON array (default) or NDJSON, one chat per line, "
+             "saved as exports/all_chats_raw.ndjson"
     )
     parser.add_argument(
         "--from-file",
-        help="Analyze from existing raw JSON file instead of fetching"
+        help="Analyze from existing raw JSON/NDJSON file instead of fetching"
     )
     parser.add_argument(
         "--max-pages",
@@ -335,6 +630,18 @@ def main():
         default=200,
         help="Maximum number of API pages to fetch (default: 200)"
     )
+    parser.add_argument(
+        "--page-limit",
+        type=int,
+        default=DEFAULT_PAGE_LIMIT,
+        help=f"Number of chats to request per API page (default: {DEFAULT_PAGE_LIMIT})"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of processes for metadata extraction (default: 1)"
+    )
 
     args = parser.parse_args()
 
@@ -342,35 +649,32 @@ def main():
     output_dir = Path(__file__).parent.parent / "exports"
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Load or fetch chats
+    # Load or fetch chats. Chats are streamed through metadata extraction
+    # one at a time, so only the metadata is kept in memory.
     if args.from_file:
         print(f"Loading chats from {args.from_file}...")
         try:
-            with open(args.from_file, 'r', encoding='utf-8') as f:
-                all_chats = json.load(f)
-            print(f"✅ Loaded {len(all_chats)} chats from file\n")
+            chats_metadata = extract_chats_metadata(iter_raw_chats(args.from_file), workers=args.workers)
+            print(f"✅ Loaded {len(chats_metadata)} chats from file\n")
         except Exception as e:
             print(f"❌ Error loading file: {e}")
             sys.exit(1)
     else:
-        # Fetch all chats
-        all_chats = fetch_all_chats(max_pages=args.max_pages)
-
-    if not all_chats:
+        # Metadata is extracted while the next page is still downloading,
+        # and --save-raw appends each chat to disk as it arrives
+        raw_ndjson = args.raw_format == "ndjson"
+        raw_path = output_dir / f"all_chats_raw.{args.raw_format}" if args.save_raw else None
+        chats_metadata = extract_chats_metadata(
+            iter_all_chats(max_pages=args.max_pages, page_limit=args.page_limit, raw_path=raw_path, raw_ndjson=raw_ndjson),
+            workers=args.workers
+        )
+        if raw_path:
+            print(f"\n💾 Raw chat data saved to: {raw_path}")
+
+    if not chats_metadata:
         print("\n❌ No chats found")
         sys.exit(1)
 
-    # Save raw data if requested (and not loading from file)
-    if args.save_raw and not args.from_file:
-        raw_path = output_dir / "all_chats_raw.json"
-        with open(raw_path, 'w', encoding='utf-8') as f:
-            json.dump(all_chats, f, indent=2)
-        print(f"\n💾 Raw chat data saved to: {raw_path}")
-
-    # Extract metadata
-    print("\nAnalyzing chat metadata...")
-    chats_metadata = [analyze_chat_metadata(chat) for chat in all_chats]
-
     # Analyze patterns
     analysis = analyze_patterns(chats_metadata)
 
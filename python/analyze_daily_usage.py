@@ -1,139 +1,219 @@
 import json
 import os
+import sys
 import argparse
-from datetime import datetime, date, timedelta, time # Added date, timedelta
+from datetime import datetime, date, timedelta # Added date, timedelta
 import pandas as pd
-import matplotlib.pyplot as plt
+import matplotlib
+matplotlib.use('Agg') # Plots are only ever saved to disk, so skip GUI backend setup
+from matplotlib.figure import Figure # Created directly, bypassing pyplot's global figure registry
 import matplotlib.dates as mdates # For better time formatting on axes
-import re # Added for date pattern matching
-
-def get_boundary_date_from_files(directory: str, filename_pattern_str: str, find_latest: bool = True) -> date | None:
+from matplotlib.collections import LineCollection # Draws every session span as a single artist
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from _session_spans import iter_span_strings, spans_from_strings
+
+try:
+    import orjson # Much faster JSON parser for large contents files
+except ImportError:
+    orjson = None
+
+try:
+    # Streams contents files one lifelog at a time when orjson is not installed. Only the C
+    # backend is used: ijson's pure-Python fallbacks are far slower than a plain json.load.
+    from ijson.backends import yajl2_c as ijson
+except ImportError:
+    ijson = None
+
+_DEBUG = bool(os.environ.get('ANALYZE_DEBUG')) # Set ANALYZE_DEBUG=1 (or pass --verbose) to print per-file [DEBUG ...] details
+
+# Export filenames are a fixed-width YYYY-MM-DD date followed by one of these suffixes
+_ANALYTICS_FILE_SUFFIX = "-analytics.md"
+_CONTENTS_FILE_SUFFIX = "-contents.json"
+_REPORT_STAMP_SUFFIX = ".stamp" # Sidecar next to each report holding its contents file signature
+
+# Session duration histogram bins (minutes)
+_DURATION_BIN_EDGES = np.array([0, 1, 5, 15, 30, 60, np.inf])
+_DURATION_BIN_LABELS = ('<1 min', '1-5 min', '5-15 min', '15-30 min', '30-60 min', '>60 min')
+_DURATION_BIN_LABEL_WIDTH = max(len(label) for label in _DURATION_BIN_LABELS)
+
+_NS_PER_HOUR = 3_600_000_000_000
+_HOUR_LABELS = tuple(f"{h:02d}:00" for h in range(25)) # 'HH:00' labels for the per-hour statistics
+
+def get_min_max_dates_from_files(directory: str, filename_suffix: str) -> tuple[date | None, date | None]:
     """
-    Scans a directory for files matching a regex pattern that captures a date (YYYY-MM-DD)
-    and returns either the latest or earliest date found.
+    Scans a directory once for files named YYYY-MM-DD<filename_suffix>
+    and returns both the earliest and the latest date found.
 
     Args:
         directory: The directory to scan.
-        filename_pattern_str: Regex string that must contain one capturing group for the date string (e.g., r"(\d{4}-\d{2}-\d{2})-analytics\.md").
-        find_latest: If True, finds the most recent (latest) date. If False, finds the oldest (earliest) date.
+        filename_suffix: The part of the filename after the date (e.g., _ANALYTICS_FILE_SUFFIX).
 
     Returns:
-        A date object or None if no matching files are found or an error occurs.
+        A (earliest, latest) tuple of date objects; both are None if no matching files are found or an error occurs.
     """
-    boundary_date = None
-    date_pattern = re.compile(filename_pattern_str)
     try:
         if not os.path.exists(directory):
             # print(f"Directory not found: {directory}")
-            return None
-        for filename in os.listdir(directory):
-            match = date_pattern.fullmatch(filename)
-            if match:
-                date_str = match.group(1)
-                try:
-                    current_file_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-                    if boundary_date is None:
-                        boundary_date = current_file_date
-                    elif find_latest and current_file_date > boundary_date:
-                        boundary_date = current_file_date
-                    elif not find_latest and current_file_date < boundary_date:
-                        boundary_date = current_file_date
-                except ValueError:
-                    # print(f"Warning: Found file with invalid date format in name: {filename}")
-                    continue
+            return None, None
+        expected_length = 10 + len(filename_suffix) # YYYY-MM-DD plus the suffix
+        with os.scandir(directory) as entries:
+            date_strs = sorted(
+                entry.name[:10] for entry in entries
+                if len(entry.name) == expected_length and entry.name.endswith(filename_suffix) and _looks_like_iso_date(entry.name)
+            )
     except Exception as e:
-        print(f"Error scanning directory {directory} with pattern {filename_pattern_str}: {e}")
-        return None
-    return boundary_date
+        print(f"Error scanning directory {directory} for *{filename_suffix} files: {e}")
+        return None, None
+    # YYYY-MM-DD strings sort chronologically, so only the ends need parsing
+    return _first_valid_date(date_strs), _first_valid_date(reversed(date_strs))
+
+def _looks_like_iso_date(name):
+    """Cheap shape check for a leading YYYY-MM-DD, without parsing it."""
+    return name[4] == '-' and name[7] == '-' and (name[:4] + name[5:7] + name[8:10]).isdigit()
+
+def _first_valid_date(date_strs):
+    """Returns the first entry that is a real calendar date (e.g. skips 2025-13-01), or None."""
+    for date_str in date_strs:
+        try:
+            return datetime.strptime(date_str, "%Y-%m-%d").date()
+        except ValueError:
+            # print(f"Warning: Found file with invalid date format in name: {date_str}")
+            continue
+    return None
+
+def get_boundary_date_from_files(directory: str, filename_suffix: str, find_latest: bool = True) -> date | None:
+    """
+    Returns either the latest or earliest date among files named YYYY-MM-DD<filename_suffix>
+    in a directory (see get_min_max_dates_from_files), or None if there are none.
+    """
+    earliest_date, latest_date = get_min_max_dates_from_files(directory, filename_suffix)
+    return latest_date if find_latest else earliest_date
 
 def load_contents_data(filepath):
     if not os.path.exists(filepath):
         print(f"Error: Data file not found at {filepath}")
         return None
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f) # Expects a list of lifelog objects
-        print(f"[DEBUG load_contents_data] Successfully loaded JSON. Type: {type(data)}, Length (if list): {len(data) if isinstance(data, list) else 'N/A'}")
-        if isinstance(data, list) and len(data) > 0:
-            print(f"[DEBUG load_contents_data] First element type: {type(data[0])}")
-            print(f"[DEBUG load_contents_data] First element keys (if dict): {data[0].keys() if isinstance(data[0], dict) else 'N/A'}")
+        if orjson:
+            with open(filepath, 'rb') as f: # orjson parses bytes directly
+                data = orjson.loads(f.read()) # Expects a list of lifelog objects
+        else:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                data = json.load(f) # Expects a list of lifelog objects
+        if _DEBUG:
+            print(f"[DEBUG load_contents_data] Successfully loaded JSON. Type: {type(data)}, Length (if list): {len(data) if isinstance(data, list) else 'N/A'}")
+            if isinstance(data, list) and len(data) > 0:
+                print(f"[DEBUG load_contents_data] First element type: {type(data[0])}")
+                print(f"[DEBUG load_contents_data] First element keys (if dict): {data[0].keys() if isinstance(data[0], dict) else 'N/A'}")
         return data
     except Exception as e:
         print(f"Error loading or parsing JSON from {filepath}: {e}")
         return None
 
 def extract_session_spans(lifelogs_data):
-    print(f"[DEBUG extract_session_spans] Received lifelogs_data. Type: {type(lifelogs_data)}, Length (if list): {len(lifelogs_data) if isinstance(lifelogs_data, list) else 'N/A'}")
-    session_spans = []
+    if _DEBUG:
+        print(f"[DEBUG extract_session_spans] Received lifelogs_data. Type: {type(lifelogs_data)}, Length (if list): {len(lifelogs_data) if isinstance(lifelogs_data, list) else 'N/A'}")
     if not isinstance(lifelogs_data, list):
         print("Error: Expected a list of lifelog objects.")
         return pd.DataFrame()
 
-    for log_entry in lifelogs_data:
-        log_id = log_entry.get('lifelog_id', 'N/A')
-        # print(f"[DEBUG extract_session_spans] Processing log_entry. ID: {log_id}") # Can be too verbose
-        contents = log_entry.get('contents')
+    return spans_from_strings(list(iter_span_strings(lifelogs_data)))
 
-        if not contents or not isinstance(contents, list) or len(contents) == 0:
-            # print(f"[DEBUG extract_session_spans] Log ID {log_id}: No contents, not a list, or empty list.")
-            continue
-
-        timestamped_segments = [seg for seg in contents if isinstance(seg, dict) and 'startTime' in seg and seg.get('type') != 'heading1' and seg.get('type') != 'heading2' and seg.get('type') != 'heading3']
-
-        # print(f"[DEBUG extract_session_spans] Log ID {log_id}: Found {len(timestamped_segments)} timestamped segments out of {len(contents)} total content items.")
+def load_session_spans(filepath):
+    """
+    Loads a contents file straight into session spans, keeping only the few strings each span
+    needs. orjson is preferred when installed since a full orjson parse beats streaming; the
+    parsed JSON is released as soon as the spans are extracted. Without orjson, ijson (if
+    installed) streams the file one lifelog at a time instead of the stdlib json full load.
 
-        if not timestamped_segments:
-            # print(f"[DEBUG extract_session_spans] Log ID {log_id}: No timestamped segments found (e.g., only headings).")
-            continue
+    Returns:
+        DataFrame: The session spans, or None if the file is missing or could not be parsed.
+    """
+    if orjson or ijson is None:
+        lifelogs_data = load_contents_data(filepath)
+        if lifelogs_data is None:
+            return None
+        return extract_session_spans(lifelogs_data)
 
-        first_segment_with_time = timestamped_segments[0]
-        last_segment_with_time = timestamped_segments[-1]
+    if not os.path.exists(filepath):
+        print(f"Error: Data file not found at {filepath}")
+        return None
+    try:
+        with open(filepath, 'rb') as f:
+            span_strings = list(iter_span_strings(ijson.items(f, 'item')))
+    except Exception as e:
+        print(f"Error loading or parsing JSON from {filepath}: {e}")
+        return None
+    return spans_from_strings(span_strings)
 
-        # print(f"[DEBUG extract_session_spans] Log ID {log_id}: First timed segment: {first_segment_with_time.get('startTime')}")
-        # print(f"[DEBUG extract_session_spans] Log ID {log_id}: Last timed segment: {last_segment_with_time.get('startTime')}, endTime (if any): {last_segment_with_time.get('endTime')}")
+def _epoch_ns(timestamps):
+    """
+    Returns a timestamp column as int64 nanoseconds since the epoch (UTC for tz-aware columns),
+    independent of the resolution pandas parsed it to.
+    """
+    return timestamps.values.astype('datetime64[ns]').view('i8')
 
-        try:
-            first_ts = pd.to_datetime(first_segment_with_time['startTime'])
-
-            if 'endTime' in last_segment_with_time and last_segment_with_time['endTime']:
-                last_ts_of_span = pd.to_datetime(last_segment_with_time['endTime'])
-            else:
-                last_ts_of_span = pd.to_datetime(last_segment_with_time['startTime'])
-
-            if last_ts_of_span < first_ts:
-                # print(f"[DEBUG extract_session_spans] Log ID {log_id}: last_ts_of_span ({last_ts_of_span}) < first_ts ({first_ts}). Adjusting.")
-                if 'endTime' in first_segment_with_time and first_segment_with_time['endTime']:
-                    potential_end = pd.to_datetime(first_segment_with_time['endTime'])
-                    if potential_end >= first_ts:
-                        last_ts_of_span = potential_end
-                    else:
-                        last_ts_of_span = first_ts + pd.Timedelta(seconds=1)
-                else:
-                     last_ts_of_span = first_ts + pd.Timedelta(seconds=1)
-                # print(f"[DEBUG extract_session_spans] Log ID {log_id}: Adjusted last_ts_of_span to {last_ts_of_span}")
-
-            session_spans.append({
-                'first_timestamp': first_ts,
-                'last_timestamp_of_span': last_ts_of_span
-            })
-            # print(f"[DEBUG extract_session_spans] Log ID {log_id}: Successfully extracted span: {first_ts} -> {last_ts_of_span}")
-        except Exception as e:
-            print(f"Warning: Could not parse timestamps for log entry ID {log_id}: {e}.")
+def _local_hours(timestamps):
+    """
+    Returns the local hour of day for each timestamp, computed from the int64 epoch values
+    shifted by the column's fixed UTC offset rather than through the .dt accessor.
+    """
+    tz = timestamps.dt.tz
+    offset = tz.utcoffset(None) if tz is not None else timedelta(0)
+    if offset is None: # Named zone with DST rules, so there is no single offset to apply
+        return timestamps.dt.hour.to_numpy()
+    offset_ns = offset // timedelta(microseconds=1) * 1000
+    return (_epoch_ns(timestamps) + offset_ns) // _NS_PER_HOUR % 24
+
+def _augment_durations(df):
+    """
+    Adds the duration_seconds and duration_minutes columns that plot_timeline and
+    print_statistics rely on, computed with plain int64 nanosecond arithmetic.
+    Called once per day, right after extract_session_spans.
+    """
+    duration_seconds = (_epoch_ns(df['last_timestamp_of_span']) - _epoch_ns(df['first_timestamp'])) / 1e9
+    df['duration_seconds'] = duration_seconds
+    df['duration_minutes'] = duration_seconds / 60 # From the ndarray, not a round-trip through the column
+    return df
 
-    return pd.DataFrame(session_spans)
+@lru_cache(maxsize=1)
+def _timeline_axes():
+    """
+    Returns the Axes that timeline plots are drawn on. One Figure is created per process
+    and cleared between dates, so a backfill does not pay for a new figure and canvas per day.
+    """
+    return Figure(figsize=(18, 10)).subplots()
 
-def plot_timeline(df, date_str, output_dir):
+def plot_timeline(df, date_str, output_dir, ax=None):
     if df.empty:
         print(f"Plotting: No data for {date_str}.")
         return None
 
-    plt.figure(figsize=(18, 10))
-    for i, row in df.iterrows():
-        plt.plot([row['first_timestamp'], row['last_timestamp_of_span']], [i, i], linewidth=5, marker='|', markersize=10, label=f"Session {i+1}" if len(df) < 20 else None)
-
-    plt.title(f'Recording Session Spans for {date_str}', fontsize=18, pad=20)
-    plt.xlabel('Hour of Day', fontsize=15, labelpad=15)
-    plt.ylabel('Recording Session Index', fontsize=15, labelpad=15)
+    if ax is None:
+        ax = _timeline_axes()
+    fig = ax.figure
+    # Reset whatever the previous date drew: axes artists/formatters and the figure-level caption
+    ax.clear()
+    for text in list(fig.texts):
+        text.remove()
+    # One LineCollection for the spans plus one scatter for the end markers, instead of a Line2D per session
+    # Fill the (N, 2, 2) segments array in place rather than stacking intermediate arrays
+    segments = np.empty((len(df), 2, 2))
+    segments[:, 0, 0] = x0 = mdates.date2num(df['first_timestamp'].values) # .values is UTC datetime64, matching Matplotlib's internal dates
+    segments[:, 1, 0] = x1 = mdates.date2num(df['last_timestamp_of_span'].values)
+    segments[:, 0, 1] = segments[:, 1, 1] = y = np.arange(len(df))
+    cycle_colors = matplotlib.rcParams['axes.prop_cycle'].by_key()['color']
+    session_colors = [cycle_colors[i % len(cycle_colors)] for i in range(len(df))]
+    ax.add_collection(LineCollection(segments, linewidths=5, colors=session_colors))
+    ax.scatter(np.concatenate([x0, x1]), np.tile(y, 2), marker='|', s=100, c=session_colors * 2)
+    ax.xaxis_date()
+    ax.autoscale_view()
+
+    ax.set_title(f'Recording Session Spans for {date_str}', fontsize=18, pad=20)
+    ax.set_xlabel('Hour of Day', fontsize=15, labelpad=15)
+    ax.set_ylabel('Recording Session Index', fontsize=15, labelpad=15)
 
     target_tz_for_formatter = None
     if not df.empty and hasattr(df['first_timestamp'].iloc[0], 'tzinfo') and df['first_timestamp'].iloc[0].tzinfo:
@@ -143,9 +223,8 @@ def plot_timeline(df, date_str, output_dir):
         formatter = mdates.DateFormatter('%H:%M', tz=target_tz_for_formatter)
     else:
         formatter = mdates.DateFormatter('%H:%M') # Fallback to default if no tz info in data
-    plt.gca().xaxis.set_major_formatter(formatter)
-    plt.gca().xaxis.set_major_locator(mdates.HourLocator(interval=1))
-    plt.gcf().autofmt_xdate(rotation=45)
+    ax.xaxis.set_major_formatter(formatter)
+    ax.xaxis.set_major_locator(mdates.HourLocator(interval=1))
 
     target_tz = None
     if not df.empty and hasattr(df['first_timestamp'].iloc[0], 'tzinfo') and df['first_timestamp'].iloc[0].tzinfo:
@@ -166,177 +245,226 @@ def plot_timeline(df, date_str, output_dir):
 
     day_end = day_start + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
 
-    plt.xlim(day_start, day_end)
-    plt.grid(True, linestyle=':', alpha=0.6)
+    ax.set_xlim(day_start, day_end)
+    # Rotate only once the limits are final: ax.clear() on the reused axes leaves tick labels that
+    # the locator replaces for the new range, and rotating those earlier would be lost
+    fig.autofmt_xdate(rotation=45)
+    ax.grid(True, linestyle=':', alpha=0.6)
 
     if not df.empty:
-        plt.ylim(-1, len(df))
+        ax.set_ylim(-1, len(df))
         if len(df) <= 20 :
-            plt.yticks(range(len(df)), [f"{j+1}" for j in range(len(df))])
+            ax.set_yticks(range(len(df)), [f"{j+1}" for j in range(len(df))])
         else:
-            plt.yticks([])
+            ax.set_yticks([])
     else:
-        plt.yticks([])
+        ax.set_yticks([])
 
-    if 'duration' not in df.columns:
-         df['duration'] = (df['last_timestamp_of_span'] - df['first_timestamp'])
-    total_recording_time_seconds = df['duration'].sum().total_seconds()
+    total_recording_time_seconds = df['duration_seconds'].sum()
     total_recording_time_hours = total_recording_time_seconds / 3600
 
-    plt.figtext(0.5, 0.01,
-                f"Total sessions: {len(df)} | Total recorded content span: {total_recording_time_hours:.2f} hours",
-                ha="center", fontsize=14, bbox=dict(facecolor='aliceblue', alpha=0.7, pad=5))
+    fig.text(0.5, 0.01,
+             f"Total sessions: {len(df)} | Total recorded content span: {total_recording_time_hours:.2f} hours",
+             ha="center", fontsize=14, bbox=dict(facecolor='aliceblue', alpha=0.7, pad=5))
 
-    plt.tight_layout(rect=[0, 0.05, 1, 0.95])
+    fig.tight_layout(rect=[0, 0.05, 1, 0.95])
     plot_filename_only = f"{date_str}-usage-timeline.png"
     plot_filepath = os.path.join(output_dir, plot_filename_only)
     try:
-        plt.savefig(plot_filepath)
+        # Fast zlib setting: PNG encoding dominates plot time, and the larger file is harmless
+        fig.savefig(plot_filepath, dpi=100, pil_kwargs={'compress_level': 1, 'optimize': False})
         print(f"Timeline plot for {date_str} saved to: {plot_filepath}")
     except Exception as e:
         print(f"Error saving plot for {date_str}: {e}")
-        plt.close()
         return None
-    plt.close()
     return plot_filename_only
 
+# Fixed parts of the statistics text, each rendered with a single format call
+_STATS_HEADER_TEMPLATE = (
+    "--- Comprehensive Usage Analytics for {date} ---\n"
+    "Date Range of Recordings: {earliest} to {latest}\n"
+    "Active Recording Span (first to last session): {active_hours:.2f} hours\n"
+    "Ratio of Recorded Time to Active Recording Span: {ratio:.2f}%\n"
+    "Total Recorded Content Span: {total_hours:.2f} hours ({total_minutes:.2f} minutes)\n"
+    "Total number of recording sessions: {num_sessions}"
+)
+_SUMMARY_STATS_TEMPLATE = (
+    "  - Mean (Average): {mean:.2f}\n"
+    "  - Median: {median:.2f}\n"
+    "  - Standard Deviation: {std:.2f}\n"
+    "  - Shortest {noun}: {min:.2f}\n"
+    "  - Longest {noun}: {max:.2f}"
+)
+
+def _summary_stats_block(values, noun):
+    """
+    Renders mean/median/std/min/max of a non-empty ndarray of minutes. The standard deviation
+    is the sample one (ddof=1, NaN for a single value), matching what pandas used to report.
+    """
+    return _SUMMARY_STATS_TEMPLATE.format(
+        mean=np.mean(values),
+        median=np.median(values),
+        std=np.std(values, ddof=1) if values.size > 1 else float('nan'),
+        min=np.min(values),
+        max=np.max(values),
+        noun=noun,
+    )
+
 def print_statistics(df, date_str):
     stats_lines = []
     if df.empty:
         no_data_message = f"Statistics: No recording sessions found for {date_str} to analyze."
         print(no_data_message)
-        stats_lines.append(no_data_message)
-        return stats_lines
+        return no_data_message
 
     num_sessions = len(df)
-    if 'duration' not in df.columns:
-        df['duration'] = df['last_timestamp_of_span'] - df['first_timestamp']
-    if 'duration_seconds' not in df.columns:
-        df['duration_seconds'] = df['duration'].dt.total_seconds()
-    if 'duration_minutes' not in df.columns:
-        df['duration_minutes'] = df['duration_seconds'] / 60
 
     total_duration_seconds = df['duration_seconds'].sum()
     total_duration_hours = total_duration_seconds / 3600
     earliest_start_dt = df['first_timestamp'].min()
     latest_end_dt = df['last_timestamp_of_span'].max()
 
-    stats_lines.append(f"--- Comprehensive Usage Analytics for {date_str} ---")
-    stats_lines.append(f"Date Range of Recordings: {earliest_start_dt.strftime('%Y-%m-%d %H:%M:%S')} to {latest_end_dt.strftime('%Y-%m-%d %H:%M:%S')}")
     active_day_span_seconds = (latest_end_dt - earliest_start_dt).total_seconds() if num_sessions > 0 else 0
-    active_day_span_hours = active_day_span_seconds / 3600
-    stats_lines.append(f"Active Recording Span (first to last session): {active_day_span_hours:.2f} hours")
     recording_ratio = (total_duration_seconds / active_day_span_seconds * 100) if active_day_span_seconds > 0 else 0
-    stats_lines.append(f"Ratio of Recorded Time to Active Recording Span: {recording_ratio:.2f}%")
-    stats_lines.append(f"Total Recorded Content Span: {total_duration_hours:.2f} hours ({total_duration_seconds/60:.2f} minutes)")
-    stats_lines.append(f"Total number of recording sessions: {num_sessions}")
+    stats_lines.append(_STATS_HEADER_TEMPLATE.format(
+        date=date_str,
+        earliest=earliest_start_dt.strftime('%Y-%m-%d %H:%M:%S'),
+        latest=latest_end_dt.strftime('%Y-%m-%d %H:%M:%S'),
+        active_hours=active_day_span_seconds / 3600,
+        ratio=recording_ratio,
+        total_hours=total_duration_hours,
+        total_minutes=total_duration_seconds / 60,
+        num_sessions=num_sessions,
+    ))
 
     if num_sessions > 0:
         stats_lines.append("Session Duration Statistics (minutes):")
-        stats_lines.append(f"  - Mean (Average): {df['duration_minutes'].mean():.2f}")
-        stats_lines.append(f"  - Median: {df['duration_minutes'].median():.2f}")
-        stats_lines.append(f"  - Standard Deviation: {df['duration_minutes'].std():.2f}")
-        stats_lines.append(f"  - Shortest Session: {df['duration_minutes'].min():.2f}")
-        stats_lines.append(f"  - Longest Session: {df['duration_minutes'].max():.2f}")
-        bins = [0, 1, 5, 15, 30, 60, float('inf')]
-        labels = ['<1 min', '1-5 min', '5-15 min', '15-30 min', '30-60 min', '>60 min']
-        df_copy = df.copy() # Ensure operations are on a copy
-        df_copy['duration_bin'] = pd.cut(df_copy['duration_minutes'], bins=bins, labels=labels, right=False)
+        duration_minutes = df['duration_minutes'].to_numpy()
+        stats_lines.append(_summary_stats_block(duration_minutes, "Session"))
+        # Left-closed bins like pd.cut(right=False), counted without building a Categorical
+        bin_codes = np.searchsorted(_DURATION_BIN_EDGES, duration_minutes, side='right') - 1
+        bin_counts = np.bincount(bin_codes, minlength=len(_DURATION_BIN_LABELS))
         stats_lines.append("Session Duration Distribution:")
-        dist_str = df_copy['duration_bin'].value_counts().sort_index().to_string()
-        stats_lines.append(dist_str)
+        # Same layout as the pandas value_counts table this used to print
+        count_width = len(str(bin_counts.max()))
+        stats_lines.append("duration_bin")
+        stats_lines.extend(f"{label:<{_DURATION_BIN_LABEL_WIDTH}}    {count:>{count_width}}" for label, count in zip(_DURATION_BIN_LABELS, bin_counts))
 
     if num_sessions > 1:
-        df_gaps_calc = df.sort_values(by='first_timestamp').copy()
-        df_gaps_calc['gap_to_next_seconds'] = (df_gaps_calc['first_timestamp'].shift(-1) - df_gaps_calc['last_timestamp_of_span']).dt.total_seconds()
-        df_gaps = df_gaps_calc[df_gaps_calc['gap_to_next_seconds'] >= 0] # Consider only positive gaps
-        df_gaps_minutes = df_gaps['gap_to_next_seconds'] / 60
+        # Work on the raw int64 nanosecond values rather than shifted/subtracted Series
+        firsts_ns = _epoch_ns(df['first_timestamp'])
+        lasts_ns = _epoch_ns(df['last_timestamp_of_span'])
+        # Daily exports are normally already in chronological order, so only reorder when they
+        # are not, and then just the two arrays rather than the whole frame
+        if (firsts_ns[1:] < firsts_ns[:-1]).any():
+            order = np.argsort(firsts_ns)
+            firsts_ns = firsts_ns[order]
+            lasts_ns = lasts_ns[order]
+        gaps_seconds = (firsts_ns[1:] - lasts_ns[:-1]) / 1e9
+        gaps_minutes = gaps_seconds[gaps_seconds >= 0] / 60 # Consider only positive gaps
         stats_lines.append("Gap Between Sessions Statistics (minutes):")
-        if not df_gaps_minutes.empty:
-            stats_lines.append(f"  - Mean (Average): {df_gaps_minutes.mean():.2f}")
-            stats_lines.append(f"  - Median: {df_gaps_minutes.median():.2f}")
-            stats_lines.append(f"  - Standard Deviation: {df_gaps_minutes.std():.2f}")
-            stats_lines.append(f"  - Shortest Gap: {df_gaps_minutes.min():.2f}")
-            stats_lines.append(f"  - Longest Gap: {df_gaps_minutes.max():.2f}")
+        if gaps_minutes.size > 0:
+            stats_lines.append(_summary_stats_block(gaps_minutes, "Gap"))
         else:
             stats_lines.append("  - No significant gaps between sessions found.")
 
     if num_sessions > 0:
-        df_hour_calc = df.copy()
-        df_hour_calc['hour_of_day'] = df_hour_calc['first_timestamp'].dt.hour
-        hourly_duration = df_hour_calc.groupby('hour_of_day')['duration_seconds'].sum()
-        if not hourly_duration.empty:
-            busiest_hour_val = hourly_duration.idxmax()
-            busiest_hour_duration_min = hourly_duration.max() / 60
-            busiest_hour_str = f"{time(busiest_hour_val).strftime('%H:%M')} - {time((busiest_hour_val + 1) % 24).strftime('%H:%M')}"
+        # Only 24 possible hours, so bincount beats a hash-based groupby/value_counts
+        hours = _local_hours(df['first_timestamp'])
+        sessions_per_hour = np.bincount(hours, minlength=24)
+        hourly_duration = np.bincount(hours, weights=df['duration_seconds'].to_numpy(), minlength=24)
+        if sessions_per_hour.any():
+            busiest_hour_val = int(np.where(sessions_per_hour > 0, hourly_duration, -1).argmax()) # Only hours that had sessions
+            busiest_hour_duration_min = hourly_duration[busiest_hour_val] / 60
+            busiest_hour_str = f"{_HOUR_LABELS[busiest_hour_val]} - {_HOUR_LABELS[(busiest_hour_val + 1) % 24]}"
             stats_lines.append(f"Busiest Hour (by total recording time): {busiest_hour_str} (with {busiest_hour_duration_min:.2f} minutes of recording)")
         stats_lines.append("Sessions Started Per Hour:")
-        sessions_per_hour = df_hour_calc['hour_of_day'].value_counts().sort_index()
-        for hour, count in sessions_per_hour.items():
-            hour_str = f"{time(hour).strftime('%H:%M')} - {time((hour + 1) % 24).strftime('%H:%M')}"
-            stats_lines.append(f"  - {hour_str}: {count} session(s)")
+        stats_lines.extend(f"  - {_HOUR_LABELS[hour]} - {_HOUR_LABELS[(hour + 1) % 24]}: {sessions_per_hour[hour]} session(s)" for hour in np.flatnonzero(sessions_per_hour))
     stats_lines.append("---")
-    for line in stats_lines:
-        print(line)
-    return stats_lines
+    full_stats_string = "\n".join(stats_lines)
+    sys.stdout.write(full_stats_string + "\n") # One write instead of a print per line
+    return full_stats_string
+
+# Full per-day report; the plot section is left out when no plot could be saved
+_MD_TEMPLATE = "# Usage Analytics for {date}\n\n## Statistics\n\n```text\n{stats}\n```\n{plot_section}"
+_MD_PLOT_SECTION = "\n## Usage Timeline Plot\n\n![Usage Timeline for {date}](./{png})\n"
 
 def daterange(start_date_dt, end_date_dt):
     for n in range(int((end_date_dt - start_date_dt).days) + 1):
         yield start_date_dt + timedelta(n)
 
+def _contents_signature(contents_path):
+    """
+    Returns a cheap 'mtime:size' signature of a contents file, or None if it cannot be stat-ed.
+    Stored next to each report so unchanged days can be skipped, like make/ninja do with inputs.
+    """
+    try:
+        st = os.stat(contents_path)
+    except OSError:
+        return None
+    return f"{st.st_mtime_ns}:{st.st_size}"
+
+def _write_report_stamp(report_filepath, contents_signature):
+    """Records the contents signature a report was generated from in a '.stamp' sidecar file."""
+    if contents_signature is None:
+        return
+    try:
+        with open(report_filepath + _REPORT_STAMP_SUFFIX, 'w', encoding='utf-8') as f:
+            f.write(contents_signature)
+    except Exception as e:
+        print(f"Warning: Could not write report stamp for {report_filepath}: {e}")
+
+def _report_is_current(report_filepath, contents_path):
+    """
+    Returns True unless the report's stamp shows its contents file has changed since it was
+    generated. Reports without a stamp (written before stamps existed) are trusted as current.
+    """
+    try:
+        with open(report_filepath + _REPORT_STAMP_SUFFIX, 'r', encoding='utf-8') as f:
+            return f.read() == _contents_signature(contents_path)
+    except FileNotFoundError:
+        return True
+
 def process_single_day_analysis(date_str, base_dir, contents_subdir, analytics_subdir):
+    """
+    Analyzes one day's contents file and writes its analytics report (plus timeline plot).
+
+    Returns:
+        tuple: (ok, num_spans) where ok is True if a report was written (even a minimal one for
+        a day without recording spans) and num_spans is the number of session spans analyzed.
+    """
     print(f"--- Starting analysis for date: {date_str} ---")
     contents_file_path = os.path.join(base_dir, contents_subdir, f"{date_str}-contents.json")
     analytics_output_dir = os.path.join(base_dir, analytics_subdir)
     os.makedirs(analytics_output_dir, exist_ok=True)
+    report_filepath = os.path.join(analytics_output_dir, f"{date_str}-analytics.md")
+    contents_signature = _contents_signature(contents_file_path) # Taken before reading, so a concurrent rewrite leaves the stamp stale
 
-    lifelogs_data = load_contents_data(contents_file_path)
-    if lifelogs_data is None:
+    session_spans_df = load_session_spans(contents_file_path)
+    if session_spans_df is None:
         print(f"No contents data found for {date_str}, or error loading. Skipping analysis.")
-        return False
-
-    session_spans_df = extract_session_spans(lifelogs_data)
+        return False, 0
 
     if session_spans_df.empty:
         print(f"No processable session spans extracted for {date_str}. This might mean no actual recording segments were found.")
         report_lines = [f"# Usage Analytics for {date_str}\\n", f"No recording session data found to analyze for {date_str}."]
-        report_filepath = os.path.join(analytics_output_dir, f"{date_str}-analytics.md")
         try:
             with open(report_filepath, 'w', encoding='utf-8') as f:
                 f.write("\n".join(report_lines))
             print(f"Minimal analytics report for {date_str} (no data) saved to: {report_filepath}")
         except Exception as e:
             print(f"Error saving minimal analytics report for {date_str}: {e}")
-            return False
-        return True
+            return False, 0
+        _write_report_stamp(report_filepath, contents_signature)
+        return True, 0
 
-    if 'duration' not in session_spans_df.columns:
-        session_spans_df['duration'] = (session_spans_df['last_timestamp_of_span'] - session_spans_df['first_timestamp'])
-    if 'duration_seconds' not in session_spans_df.columns:
-        session_spans_df['duration_seconds'] = session_spans_df['duration'].dt.total_seconds()
-    if 'duration_minutes' not in session_spans_df.columns:
-        session_spans_df['duration_minutes'] = session_spans_df['duration_seconds'] / 60
+    _augment_durations(session_spans_df)
 
     plot_filename = plot_timeline(session_spans_df, date_str, analytics_output_dir)
-    statistics_output_list = print_statistics(session_spans_df, date_str)
-
-    markdown_lines = []
-    markdown_lines.append(f"# Usage Analytics for {date_str}")
-    markdown_lines.append("") # Blank line
-    markdown_lines.append("## Statistics")
-    markdown_lines.append("") # Blank line
-    markdown_lines.append("```text")
-    markdown_lines.extend(statistics_output_list)
-    markdown_lines.append("```")
-
-    if plot_filename:
-        markdown_lines.append("") # Blank line
-        markdown_lines.append("## Usage Timeline Plot")
-        markdown_lines.append("") # Blank line
-        markdown_lines.append(f"![Usage Timeline for {date_str}](./{plot_filename})")
+    statistics_output = print_statistics(session_spans_df, date_str)
 
-    report_filepath = os.path.join(analytics_output_dir, f"{date_str}-analytics.md")
-    final_markdown_string = "\n".join(markdown_lines) + "\n"
+    plot_section = _MD_PLOT_SECTION.format(date=date_str, png=plot_filename) if plot_filename else ""
+    final_markdown_string = _MD_TEMPLATE.format(date=date_str, stats=statistics_output, plot_section=plot_section)
 
     try:
         with open(report_filepath, 'w', encoding='utf-8') as f:
@@ -344,10 +472,22 @@ def process_single_day_analysis(date_str, base_dir, contents_subdir, analytics_s
         print(f"Full analytics report for {date_str} saved to: {report_filepath}")
     except Exception as e:
         print(f"Error saving full analytics report for {date_str}: {e}")
-        return False
+        return False, len(session_spans_df)
 
+    _write_report_stamp(report_filepath, contents_signature)
     print(f"Analysis for {date_str} completed successfully.")
-    return True
+    return True, len(session_spans_df)
+
+def process_date(date_str, base_dir, contents_subdir, analytics_subdir):
+    """
+    Runs the full analysis for one date and reports how it went. Top-level so it can be
+    shipped to worker processes.
+
+    Returns:
+        tuple: (date_str, ok, num_spans) as reported by process_single_day_analysis.
+    """
+    ok, num_spans = process_single_day_analysis(date_str, base_dir, contents_subdir, analytics_subdir)
+    return date_str, ok, num_spans
 
 def main():
     parser = argparse.ArgumentParser(description="Analyze daily usage from structured JSON lifelog data for a date or date range.")
@@ -355,8 +495,19 @@ def main():
                         help="Start date for analysis (YYYY-MM-DD). Defaults to smart range based on last processed analytics and available content.")
     parser.add_argument("end_date_str", metavar="END_DATE", type=str, nargs='?', default=None,
                         help="End date for analysis (YYYY-MM-DD). Defaults to START_DATE if START_DATE is provided, otherwise part of smart range or yesterday.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Number of processes used to analyze dates in parallel (default: number of CPU cores).")
+    parser.add_argument("--force", action="store_true",
+                        help="Regenerate analytics reports for dates that already have one.")
+    parser.add_argument("--verbose", action="store_true",
+                        help="Print per-file [DEBUG ...] details (same as setting ANALYZE_DEBUG=1).")
     args = parser.parse_args()
 
+    if args.verbose:
+        global _DEBUG
+        _DEBUG = True
+        os.environ['ANALYZE_DEBUG'] = '1' # So worker processes started with spawn see it too
+
     today = date.today()
     yesterday = today - timedelta(days=1)
 
@@ -371,19 +522,14 @@ def main():
     contents_dir_abs = os.path.join(base_exports_dir, contents_subdir_name)
     os.makedirs(contents_dir_abs, exist_ok=True)
 
-    # Define filename patterns for boundary checks
-    analytics_file_pattern = r"(\d{4}-\d{2}-\d{2})-analytics\.md"
-    contents_file_pattern = r"(\d{4}-\d{2}-\d{2})-contents\.json"
-
     start_dt = None
     end_dt = None
 
     if args.start_date_str is None and args.end_date_str is None:
         print("No start or end date provided. Attempting to determine optimal date range...")
 
-        last_analytics_dt = get_boundary_date_from_files(analytics_dir_abs, analytics_file_pattern, find_latest=True)
-        earliest_contents_dt = get_boundary_date_from_files(contents_dir_abs, contents_file_pattern, find_latest=False)
-        latest_contents_dt = get_boundary_date_from_files(contents_dir_abs, contents_file_pattern, find_latest=True)
+        last_analytics_dt = get_boundary_date_from_files(analytics_dir_abs, _ANALYTICS_FILE_SUFFIX, find_latest=True)
+        earliest_contents_dt, latest_contents_dt = get_min_max_dates_from_files(contents_dir_abs, _CONTENTS_FILE_SUFFIX) # One scan for both ends
 
         if last_analytics_dt:
             print(f"Last analytics report found for: {last_analytics_dt.strftime('%Y-%m-%d')}")
@@ -462,38 +608,50 @@ def main():
     failed_days = 0
     days_with_no_data_to_analyze = 0 # Renamed for clarity
     days_skipped_missing_content = 0
+    days_skipped_already_analyzed = 0
 
+    # List the contents (and, unless forced, analytics) directories once instead of stat-ing paths per date
+    with os.scandir(contents_dir_abs) as entries:
+        available_content_dates = {entry.name[:10] for entry in entries if entry.name.endswith(_CONTENTS_FILE_SUFFIX)}
+    analyzed_dates = set()
+    if not args.force:
+        with os.scandir(analytics_dir_abs) as entries:
+            analyzed_dates = {entry.name[:10] for entry in entries if entry.name.endswith(_ANALYTICS_FILE_SUFFIX)}
+
+    dates_to_process = []
     for single_date_dt in daterange(start_dt, end_dt):
         date_str_loop = single_date_dt.strftime("%Y-%m-%d")
 
-        contents_file_to_check = os.path.join(contents_dir_abs, f"{date_str_loop}-contents.json")
-        if not os.path.exists(contents_file_to_check):
+        if date_str_loop not in available_content_dates:
+            contents_file_to_check = os.path.join(contents_dir_abs, f"{date_str_loop}-contents.json")
             print(f"Prerequisite contents file '{contents_file_to_check}' not found for {date_str_loop}. Skipping analysis for this day.")
             days_skipped_missing_content +=1
             continue
+        if date_str_loop in analyzed_dates:
+            report_filepath = os.path.join(analytics_dir_abs, f"{date_str_loop}{_ANALYTICS_FILE_SUFFIX}")
+            if _report_is_current(report_filepath, os.path.join(contents_dir_abs, f"{date_str_loop}{_CONTENTS_FILE_SUFFIX}")):
+                print(f"Analytics report for {date_str_loop} already exists. Skipping (use --force to regenerate).")
+                days_skipped_already_analyzed += 1
+                continue
+            print(f"Contents for {date_str_loop} changed since its analytics report was generated. Regenerating.")
+        dates_to_process.append(date_str_loop)
+
+    # Each date is independent (load, parse, plot, write), so spread them over worker processes.
+    # process_date returns True for ok if a report was written (even a minimal one for no data)
+    # and False if there was an error during processing (e.g., cannot write report).
+    run_date = partial(process_date, base_dir=base_exports_dir, contents_subdir=contents_subdir_name, analytics_subdir=analytics_subdir_name)
+    workers = min(args.workers, len(dates_to_process))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(run_date, dates_to_process))
+    else:
+        results = [run_date(date_str_loop) for date_str_loop in dates_to_process]
 
-        # process_single_day_analysis now handles its own file loading and empty data checks
-        # It returns True if it successfully created a report (even a minimal one for no data)
-        # and False if there was an error during processing (e.g., cannot write report).
-
-        # To check if it was a "no data" scenario vs "data analyzed":
-        # We need to know if the function returned True because it made a *minimal* report
-        # or a *full* one. The current return of process_single_day_analysis doesn't distinguish.
-        # Let's refine process_single_day_analysis to return a status or make the check here.
-        # For now, we'll assume if process_single_day_analysis returns True, it's "successful"
-        # and the distinction of "no data" vs "data" is logged by that function.
-
-        if process_single_day_analysis(date_str_loop, base_exports_dir, contents_subdir_name, analytics_subdir_name):
+    for _, ok, num_spans in results:
+        if ok:
             successful_days += 1
-            # To correctly count days_with_no_data_to_analyze, we'd need more info from process_single_day_analysis
-            # or re-evaluate here. For now, this counter might not be accurate based on new structure.
-            # The function `process_single_day_analysis` already prints if no spans were extracted.
-            # We can add a specific check here if needed:
-            temp_contents_data = load_contents_data(contents_file_to_check)
-            if temp_contents_data:
-                temp_spans = extract_session_spans(temp_contents_data)
-                if temp_spans.empty:
-                    days_with_no_data_to_analyze +=1 # Increment if processed successfully but had no actual spans.
+            if num_spans == 0:
+                days_with_no_data_to_analyze +=1 # Processed successfully but had no actual spans.
         else:
             failed_days += 1
 
@@ -503,10 +661,12 @@ def main():
          print(f"  (Out of these, {days_with_no_data_to_analyze} days had content but no actual recording spans to analyze in depth, resulting in a minimal report.)")
     if days_skipped_missing_content > 0:
         print(f"Days skipped due to missing prerequisite content files: {days_skipped_missing_content}")
+    if days_skipped_already_analyzed > 0:
+        print(f"Days skipped because an analytics report already exists: {days_skipped_already_analyzed}")
     if failed_days > 0:
         print(f"Days where analysis processing failed (error during report generation): {failed_days}")
 
-    if successful_days == 0 and days_skipped_missing_content == 0 and failed_days == 0:
+    if successful_days == 0 and days_skipped_missing_content == 0 and days_skipped_already_analyzed == 0 and failed_days == 0:
         print("No days in the specified range required processing or were available for processing.")
 
 
@@ -3,10 +3,39 @@ import os
 import argparse
 from datetime import datetime, date, timedelta, time
 import pandas as pd
-import matplotlib.pyplot as plt
+import matplotlib
+matplotlib.use('Agg') # Reports only ever go to PNG files, so skip loading any GUI toolkit
+matplotlib.rcParams['font.family'] = 'DejaVu Sans' # Bundled with matplotlib; skips the sans-serif fallback search
+matplotlib.rcParams['text.usetex'] = False
+matplotlib.rcParams['path.simplify'] = True
+matplotlib.rcParams['path.simplify_threshold'] = 1.0 # Drop sub-pixel vertices when rendering lines
+matplotlib.rcParams['agg.path.chunksize'] = 10000 # Render long paths in chunks
+from matplotlib.figure import Figure # Created directly, bypassing pyplot's global figure registry
+from matplotlib.artist import setp
 import matplotlib.dates as mdates
 import calendar
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from _session_spans import iter_span_strings, spans_from_strings
+
+try:
+    import orjson # Much faster JSON parser for large contents files
+except ImportError:
+    orjson = None
+
+try:
+    # Streams contents files one lifelog at a time when orjson is not installed. Only the C
+    # backend is used: ijson's pure-Python fallbacks are far slower than a plain json.load.
+    from ijson.backends import yajl2_c as ijson
+except ImportError:
+    ijson = None
+
+_NS_PER_HOUR = 3_600_000_000_000
+
+# Session duration buckets (minutes), left-closed like pd.cut(right=False)
+_DURATION_BIN_EDGES = np.array([0, 1, 5, 15, 30, 60, np.inf])
+_DURATION_BIN_LABELS = ('<1 min', '1-5 min', '5-15 min', '15-30 min', '30-60 min', '>60 min')
 
 # --- Data Loading & Initial Processing (Adapted from analyze_daily_usage.py) ---
 
@@ -15,68 +44,123 @@ def load_contents_data(filepath):
         # print(f"Info: Data file not found at {filepath}") # Less verbose for batch processing
         return None
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        if orjson:
+            with open(filepath, 'rb') as f: # orjson parses bytes directly
+                data = orjson.loads(f.read())
+        else:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
         return data
     except Exception as e:
         print(f"Error loading or parsing JSON from {filepath}: {e}")
         return None
 
 def extract_session_spans(lifelogs_data, log_date_str):
-    session_spans = []
     if not isinstance(lifelogs_data, list):
         print(f"Error for {log_date_str}: Expected a list of lifelog objects.")
         return pd.DataFrame()
 
-    for log_entry in lifelogs_data:
-        log_id = log_entry.get('lifelog_id', 'N/A')
-        contents = log_entry.get('contents')
-
-        if not contents or not isinstance(contents, list) or len(contents) == 0:
-            continue
+    return spans_from_strings(list(iter_span_strings(lifelogs_data)), _unparseable_warning(log_date_str))
 
-        timestamped_segments = [seg for seg in contents if isinstance(seg, dict) and 'startTime' in seg and seg.get('type') != 'heading1' and seg.get('type') != 'heading2' and seg.get('type') != 'heading3']
+def _unparseable_warning(log_date_str):
+    """Returns the per-span warning template for spans_from_strings, naming the day being loaded."""
+    return f"Warning for {log_date_str} (log ID {{log_id}}): Could not parse timestamps."
 
-        if not timestamped_segments:
-            continue
+def load_session_spans(filepath, log_date_str):
+    """
+    Loads a contents file straight into session spans, keeping only the few strings each span
+    needs. orjson is preferred when installed since a full orjson parse beats streaming.
+    Without orjson, ijson (if installed) streams the file one lifelog at a time instead of
+    the stdlib json full load.
 
-        first_segment_with_time = timestamped_segments[0]
-        last_segment_with_time = timestamped_segments[-1]
+    Returns:
+        DataFrame: The session spans, or None if the file is missing, empty or could not be parsed.
+    """
+    if orjson or ijson is None:
+        lifelogs_data = load_contents_data(filepath)
+        if not lifelogs_data:
+            return None
+        return extract_session_spans(lifelogs_data, log_date_str)
 
-        try:
-            first_ts = pd.to_datetime(first_segment_with_time['startTime'])
-            if 'endTime' in last_segment_with_time and last_segment_with_time['endTime']:
-                last_ts_of_span = pd.to_datetime(last_segment_with_time['endTime'])
-            else:
-                last_ts_of_span = pd.to_datetime(last_segment_with_time['startTime'])
-
-            if last_ts_of_span < first_ts:
-                if 'endTime' in first_segment_with_time and first_segment_with_time['endTime']:
-                    potential_end = pd.to_datetime(first_segment_with_time['endTime'])
-                    if potential_end >= first_ts:
-                        last_ts_of_span = potential_end
-                    else:
-                        last_ts_of_span = first_ts + pd.Timedelta(seconds=1)
-                else:
-                     last_ts_of_span = first_ts + pd.Timedelta(seconds=1)
-
-            session_spans.append({
-                'first_timestamp': first_ts,
-                'last_timestamp_of_span': last_ts_of_span
-            })
-        except Exception as e:
-            print(f"Warning for {log_date_str} (log ID {log_id}): Could not parse timestamps: {e}.")
-
-    return pd.DataFrame(session_spans)
+    if not os.path.exists(filepath):
+        return None
+    try:
+        with open(filepath, 'rb') as f:
+            span_strings = list(iter_span_strings(ijson.items(f, 'item')))
+    except Exception as e:
+        print(f"Error loading or parsing JSON from {filepath}: {e}")
+        return None
+    return spans_from_strings(span_strings, _unparseable_warning(log_date_str))
+
+def _epoch_ns(timestamps):
+    """
+    Returns a timestamp column as int64 nanoseconds since the epoch (UTC for tz-aware columns),
+    independent of the resolution pandas parsed it to.
+    """
+    return timestamps.values.astype('datetime64[ns]').view('i8')
+
+def _local_hours(timestamps):
+    """
+    Returns the local hour of day for each timestamp, computed from the int64 epoch values
+    shifted by the column's fixed UTC offset rather than through the .dt accessor.
+    """
+    tz = timestamps.dt.tz
+    offset = tz.utcoffset(None) if tz is not None else timedelta(0)
+    if offset is None: # Named zone with DST rules, so there is no single offset to apply
+        return timestamps.dt.hour.to_numpy()
+    offset_ns = offset // timedelta(microseconds=1) * 1000
+    return (_epoch_ns(timestamps) + offset_ns) // _NS_PER_HOUR % 24
+
+def process_day(current_date_dt, contents_dir):
+    """
+    Loads one day's contents file and extracts its raw session spans, tagged with their day.
+    Top-level so it can be shipped to worker processes.
+
+    Returns:
+        tuple: (current_date_dt, df_day_sessions), where df_day_sessions is None if the day
+               has no contents file or no session spans.
+    """
+    target_date_str = current_date_dt.strftime("%Y-%m-%d")
+    contents_file_path = os.path.join(contents_dir, f"{target_date_str}-contents.json")
+    df_day_sessions = load_session_spans(contents_file_path, target_date_str)
+    if df_day_sessions is None or df_day_sessions.empty:
+        return current_date_dt, None
+
+    # Store local wall-clock times: days on either side of a DST change have different UTC
+    # offsets and would otherwise concatenate into an object column. Within one day every
+    # timestamp shares an offset, so durations and hours are unaffected.
+    for column in ('first_timestamp', 'last_timestamp_of_span'):
+        if df_day_sessions[column].dt.tz is not None:
+            df_day_sessions[column] = df_day_sessions[column].dt.tz_localize(None)
+    df_day_sessions['day_index'] = np.int8(current_date_dt.day - 1) # Position in the month, for the per-day rollup
+    return current_date_dt, df_day_sessions
 
 # --- Monthly Plotting Functions ---
 
-def plot_daily_trends(daily_summary_df, month_year_str, output_dir):
+# Batch reports are for quick browsing: slightly reduced DPI, no tight-bbox pass (layouts are
+# fixed with tight_layout) and the fastest zlib level, since PNG encoding dominates plot time
+_PNG_SAVE_KWARGS = {'dpi': 90, 'bbox_inches': None, 'pil_kwargs': {'compress_level': 1, 'optimize': False}}
+
+def _reset_figure(fig, figsize):
+    """
+    Clears a report Figure (including any twin axes from the previous plot) and resizes it,
+    so one canvas can be reused for all the monthly plots. Creates a Figure if none is given.
+
+    Returns:
+        tuple: (fig, ax) with a single fresh Axes.
+    """
+    if fig is None:
+        fig = Figure()
+    fig.clear()
+    fig.set_size_inches(figsize)
+    return fig, fig.subplots()
+
+def plot_daily_trends(daily_summary_df, month_year_str, output_dir, fig=None):
     if daily_summary_df.empty:
         print(f"Plotting: No daily summary data for {month_year_str} to plot trends.")
         return None
 
-    fig, ax1 = plt.subplots(figsize=(18, 10))
+    fig, ax1 = _reset_figure(fig, (18, 10))
 
     # Plot Total Duration
     color = 'tab:blue'
@@ -85,7 +169,7 @@ def plot_daily_trends(daily_summary_df, month_year_str, output_dir):
     ax1.plot(daily_summary_df['date'], daily_summary_df['total_duration_hours'], color=color, marker='o', linestyle='-')
     ax1.tick_params(axis='y', labelcolor=color)
     ax1.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m-%d')) # More specific date format
-    plt.setp(ax1.xaxis.get_majorticklabels(), rotation=45, ha="right")
+    setp(ax1.xaxis.get_majorticklabels(), rotation=45, ha="right")
 
 
     # Plot Session Count on a second y-axis
@@ -96,74 +180,68 @@ def plot_daily_trends(daily_summary_df, month_year_str, output_dir):
     ax2.tick_params(axis='y', labelcolor=color)
 
     fig.tight_layout(rect=[0, 0.05, 1, 0.93]) # Adjust layout to prevent overlap
-    plt.title(f'Daily Recording Trends for {month_year_str}', fontsize=18, pad=20)
-    plt.grid(True, linestyle=':', alpha=0.7)
+    ax2.set_title(f'Daily Recording Trends for {month_year_str}', fontsize=18, pad=20)
+    ax2.grid(True, linestyle=':', alpha=0.7)
 
     plot_filename_only = f"{month_year_str}-daily-trends.png"
     plot_filepath = os.path.join(output_dir, plot_filename_only)
     try:
-        plt.savefig(plot_filepath)
+        fig.savefig(plot_filepath, **_PNG_SAVE_KWARGS)
         print(f"Daily trends plot for {month_year_str} saved to: {plot_filepath}")
     except Exception as e:
         print(f"Error saving daily trends plot for {month_year_str}: {e}")
-        plt.close()
         return None
-    plt.close()
     return plot_filename_only
 
 
-def plot_session_duration_histogram(all_sessions_combined_df, month_year_str, output_dir):
+def plot_session_duration_histogram(all_sessions_combined_df, month_year_str, output_dir, fig=None):
     if all_sessions_combined_df.empty or 'duration_minutes' not in all_sessions_combined_df:
         print(f"Plotting: No session duration data for {month_year_str} to plot histogram.")
         return None
 
-    plt.figure(figsize=(12, 7))
-    plt.hist(all_sessions_combined_df['duration_minutes'], bins=20, color='skyblue', edgecolor='black')
-    plt.title(f'Distribution of Session Durations for {month_year_str}', fontsize=16, pad=15)
-    plt.xlabel('Session Duration (minutes)', fontsize=12, labelpad=10)
-    plt.ylabel('Number of Sessions', fontsize=12, labelpad=10)
-    plt.grid(axis='y', alpha=0.75)
-    plt.tight_layout()
+    fig, ax = _reset_figure(fig, (12, 7))
+    ax.hist(all_sessions_combined_df['duration_minutes'], bins=20, color='skyblue', edgecolor='black')
+    ax.set_title(f'Distribution of Session Durations for {month_year_str}', fontsize=16, pad=15)
+    ax.set_xlabel('Session Duration (minutes)', fontsize=12, labelpad=10)
+    ax.set_ylabel('Number of Sessions', fontsize=12, labelpad=10)
+    ax.grid(axis='y', alpha=0.75)
+    fig.tight_layout()
 
     plot_filename_only = f"{month_year_str}-session-durations-histogram.png"
     plot_filepath = os.path.join(output_dir, plot_filename_only)
     try:
-        plt.savefig(plot_filepath)
+        fig.savefig(plot_filepath, **_PNG_SAVE_KWARGS)
         print(f"Session duration histogram for {month_year_str} saved to: {plot_filepath}")
     except Exception as e:
         print(f"Error saving session duration histogram for {month_year_str}: {e}")
-        plt.close()
         return None
-    plt.close()
     return plot_filename_only
 
-def plot_hourly_activity_barchart(all_sessions_combined_df, month_year_str, output_dir):
+def plot_hourly_activity_barchart(all_sessions_combined_df, month_year_str, output_dir, fig=None):
     if all_sessions_combined_df.empty or 'hour_of_day' not in all_sessions_combined_df:
         print(f"Plotting: No hourly activity data for {month_year_str} to plot barchart.")
         return None
 
-    hourly_total_duration_hours = all_sessions_combined_df.groupby('hour_of_day')['duration_seconds'].sum() / 3600
-    hourly_total_duration_hours = hourly_total_duration_hours.reindex(range(24), fill_value=0) # Ensure all hours are present
+    # minlength=24 ensures all hours are present
+    hourly_total_duration_hours = pd.Series(np.bincount(all_sessions_combined_df['hour_of_day'].to_numpy(), weights=all_sessions_combined_df['duration_seconds'].to_numpy(), minlength=24) / 3600)
 
-    plt.figure(figsize=(15, 8))
-    hourly_total_duration_hours.plot(kind='bar', color='lightcoral', edgecolor='black')
-    plt.title(f'Total Recording Duration per Hour for {month_year_str}', fontsize=16, pad=15)
-    plt.xlabel('Hour of Day (00:00 - 23:00)', fontsize=12, labelpad=10)
-    plt.ylabel('Total Recorded Hours', fontsize=12, labelpad=10)
-    plt.xticks(ticks=range(24), labels=[f"{h:02d}:00" for h in range(24)], rotation=45, ha="right")
-    plt.grid(axis='y', alpha=0.75)
-    plt.tight_layout()
+    fig, ax = _reset_figure(fig, (15, 8))
+    hourly_total_duration_hours.plot(kind='bar', color='lightcoral', edgecolor='black', ax=ax)
+    ax.set_title(f'Total Recording Duration per Hour for {month_year_str}', fontsize=16, pad=15)
+    ax.set_xlabel('Hour of Day (00:00 - 23:00)', fontsize=12, labelpad=10)
+    ax.set_ylabel('Total Recorded Hours', fontsize=12, labelpad=10)
+    ax.set_xticks(range(24), labels=[f"{h:02d}:00" for h in range(24)], rotation=45, ha="right")
+    ax.grid(axis='y', alpha=0.75)
+    fig.tight_layout()
 
     plot_filename_only = f"{month_year_str}-hourly-activity.png"
     plot_filepath = os.path.join(output_dir, plot_filename_only)
     try:
-        plt.savefig(plot_filepath)
+        fig.savefig(plot_filepath, **_PNG_SAVE_KWARGS)
         print(f"Hourly activity barchart for {month_year_str} saved to: {plot_filepath}")
     except Exception as e:
         print(f"Error saving hourly activity barchart for {month_year_str}: {e}")
-        plt.close()
         return None
-    plt.close()
     return plot_filename_only
 
 # --- Main Analysis and Reporting ---
@@ -177,12 +255,13 @@ def generate_monthly_stats_text(month_year_str, daily_summary_df, all_sessions_c
         stats_lines.append("\nNo recording data found for this month.")
         return "\n".join(stats_lines)
 
-    # Overall Monthly Stats
-    total_recorded_hours_month = daily_summary_df['total_duration_hours'].sum()
-    avg_daily_recorded_hours = daily_summary_df['total_duration_hours'].mean()
-    std_daily_recorded_hours = daily_summary_df['total_duration_hours'].std()
-    total_sessions_month = daily_summary_df['session_count'].sum()
-    avg_daily_sessions = daily_summary_df['session_count'].mean()
+    # Overall Monthly Stats, all from one agg() call over the daily summary
+    daily_stats = daily_summary_df.agg({'total_duration_hours': ['sum', 'mean', 'std'], 'session_count': ['sum', 'mean']})
+    total_recorded_hours_month = daily_stats.at['sum', 'total_duration_hours']
+    avg_daily_recorded_hours = daily_stats.at['mean', 'total_duration_hours']
+    std_daily_recorded_hours = daily_stats.at['std', 'total_duration_hours']
+    total_sessions_month = daily_stats.at['sum', 'session_count']
+    avg_daily_sessions = daily_stats.at['mean', 'session_count']
 
     stats_lines.append("\nOverall Monthly Recording Summary:")
     stats_lines.append(f"  - Total Recorded Hours: {total_recorded_hours_month:.2f} hours")
@@ -192,35 +271,38 @@ def generate_monthly_stats_text(month_year_str, daily_summary_df, all_sessions_c
 
     # Session Duration Statistics (Month-wide)
     if 'duration_minutes' in all_sessions_combined_df and not all_sessions_combined_df['duration_minutes'].empty:
+        duration_stats = all_sessions_combined_df['duration_minutes'].agg(['mean', 'median', 'std', 'min', 'max'])
         stats_lines.append("\nSession Duration Statistics (all sessions in month, minutes):")
-        stats_lines.append(f"  - Mean (Average): {all_sessions_combined_df['duration_minutes'].mean():.2f}")
-        stats_lines.append(f"  - Median: {all_sessions_combined_df['duration_minutes'].median():.2f}")
-        stats_lines.append(f"  - Standard Deviation: {all_sessions_combined_df['duration_minutes'].std():.2f}")
-        stats_lines.append(f"  - Shortest Session: {all_sessions_combined_df['duration_minutes'].min():.2f}")
-        stats_lines.append(f"  - Longest Session: {all_sessions_combined_df['duration_minutes'].max():.2f}")
-
-        bins = [0, 1, 5, 15, 30, 60, float('inf')]
-        labels = ['<1 min', '1-5 min', '5-15 min', '15-30 min', '30-60 min', '>60 min']
-        # Ensure 'duration_minutes' is present before using it for cut
-        if 'duration_minutes' in all_sessions_combined_df.columns:
-            duration_bin_counts = pd.cut(all_sessions_combined_df['duration_minutes'], bins=bins, labels=labels, right=False).value_counts().sort_index()
-            stats_lines.append("  - Session Duration Distribution:")
-            for label, count in duration_bin_counts.items():
-                stats_lines.append(f"    - {label}: {count}")
+        stats_lines.append(f"  - Mean (Average): {duration_stats['mean']:.2f}")
+        stats_lines.append(f"  - Median: {duration_stats['median']:.2f}")
+        stats_lines.append(f"  - Standard Deviation: {duration_stats['std']:.2f}")
+        stats_lines.append(f"  - Shortest Session: {duration_stats['min']:.2f}")
+        stats_lines.append(f"  - Longest Session: {duration_stats['max']:.2f}")
+
+        # Left-closed bins like pd.cut(right=False), counted without building a Categorical
+        bin_codes = np.searchsorted(_DURATION_BIN_EDGES, all_sessions_combined_df['duration_minutes'].to_numpy(), side='right') - 1
+        duration_bin_counts = np.bincount(bin_codes, minlength=len(_DURATION_BIN_LABELS))
+        stats_lines.append("  - Session Duration Distribution:")
+        for label, count in zip(_DURATION_BIN_LABELS, duration_bin_counts):
+            stats_lines.append(f"    - {label}: {count}")
 
 
     # Hourly Activity (Month-wide)
     if 'hour_of_day' in all_sessions_combined_df and not all_sessions_combined_df.empty:
-        hourly_total_duration_seconds = all_sessions_combined_df.groupby('hour_of_day')['duration_seconds'].sum()
-        if not hourly_total_duration_seconds.empty:
-            busiest_hour_val = hourly_total_duration_seconds.idxmax()
-            busiest_hour_duration_min = hourly_total_duration_seconds.max() / 60
+        # Only 24 possible hours, so bincount beats a hash-based groupby/value_counts
+        hours = all_sessions_combined_df['hour_of_day'].to_numpy()
+        sessions_per_hour_month = np.bincount(hours, minlength=24)
+        hourly_total_duration_seconds = np.bincount(hours, weights=all_sessions_combined_df['duration_seconds'].to_numpy(), minlength=24)
+        if sessions_per_hour_month.any():
+            busiest_hour_val = int(np.where(sessions_per_hour_month > 0, hourly_total_duration_seconds, -1).argmax()) # Only hours that had sessions
+            busiest_hour_duration_min = hourly_total_duration_seconds[busiest_hour_val] / 60
             busiest_hour_str = f"{time(busiest_hour_val).strftime('%H:00')} - {time((busiest_hour_val + 1) % 24).strftime('%H:00')}" # Simpler format for month
             stats_lines.append(f"\nBusiest Hour (by total recording time across month): {busiest_hour_str} (with {busiest_hour_duration_min:.2f} total minutes of recording)")
 
-        sessions_per_hour_month = all_sessions_combined_df['hour_of_day'].value_counts().sort_index()
         stats_lines.append("\nTotal Sessions Started Per Hour (across month):")
-        for hour, count in sessions_per_hour_month.items():
+        for hour, count in enumerate(sessions_per_hour_month):
+            if count == 0:
+                continue
             hour_str = f"{time(hour).strftime('%H:00')} - {time((hour + 1) % 24).strftime('%H:00')}"
             stats_lines.append(f"  - {hour_str}: {count} session(s)")
 
@@ -240,6 +322,8 @@ def generate_monthly_stats_text(month_year_str, daily_summary_df, all_sessions_c
 def main():
     parser = argparse.ArgumentParser(description="Analyze monthly lifelog usage from local contents.json files and generate a markdown report.")
     parser.add_argument("year_month", type=str, help="Month to analyze, in YYYY-MM format.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Number of processes used to load and parse days in parallel (default: number of CPU cores).")
     args = parser.parse_args()
 
     try:
@@ -263,7 +347,6 @@ def main():
     monthly_plots_output_dir = os.path.join(monthly_analytics_base_dir, f"{month_year_str}_plots")
     os.makedirs(monthly_plots_output_dir, exist_ok=True) # For plots
 
-    daily_metrics_list = []
     all_sessions_dfs = []
     days_with_data_count = 0
     processed_dates_for_log = []
@@ -274,41 +357,25 @@ def main():
     print(f"Report will be saved in: {monthly_analytics_base_dir}")
 
 
-    for day_num in range(num_days_in_month):
-        current_date_dt = start_date_month + timedelta(days=day_num)
-        target_date_str = current_date_dt.strftime("%Y-%m-%d")
-        # print(f"Processing data for {target_date_str}...")
-
-        contents_file_path = os.path.join(project_root, "exports", "contents", f"{target_date_str}-contents.json")
-        lifelogs_data = load_contents_data(contents_file_path)
-
-        if lifelogs_data:
-            df_day_sessions = extract_session_spans(lifelogs_data, target_date_str)
-            if not df_day_sessions.empty:
-                days_with_data_count += 1
-                processed_dates_for_log.append(target_date_str)
-
-                df_day_sessions = df_day_sessions.sort_values(by='first_timestamp').reset_index(drop=True)
-                df_day_sessions['duration'] = df_day_sessions['last_timestamp_of_span'] - df_day_sessions['first_timestamp']
-                df_day_sessions['duration_seconds'] = df_day_sessions['duration'].dt.total_seconds()
-                df_day_sessions['duration_minutes'] = df_day_sessions['duration_seconds'] / 60
-                df_day_sessions['hour_of_day'] = df_day_sessions['first_timestamp'].dt.hour # For hourly aggregation
-
-                total_duration_seconds_day = df_day_sessions['duration_seconds'].sum()
-                session_count_day = len(df_day_sessions)
-
-                daily_metrics_list.append({
-                    'date': current_date_dt, # Store as datetime.date for easier plotting
-                    'total_duration_hours': total_duration_seconds_day / 3600,
-                    'session_count': session_count_day
-                })
-                all_sessions_dfs.append(df_day_sessions)
-            # else:
-                # print(f"No valid session spans extracted for {target_date_str}.")
-        # else:
-            # print(f"No contents file found for {target_date_str}.")
-
-    if not daily_metrics_list:
+    # Each day's file is independent (read, JSON parse, timestamp parse), so spread them over
+    # worker processes; map() keeps the results in calendar order
+    month_dates = [start_date_month + timedelta(days=day_num) for day_num in range(num_days_in_month)]
+    load_day = partial(process_day, contents_dir=os.path.join(project_root, "exports", "contents"))
+    workers = min(args.workers, num_days_in_month)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            day_results = list(executor.map(load_day, month_dates, chunksize=4))
+    else:
+        day_results = [load_day(current_date_dt) for current_date_dt in month_dates]
+
+    for current_date_dt, df_day_sessions in day_results:
+        if df_day_sessions is None:
+            continue
+        days_with_data_count += 1
+        processed_dates_for_log.append(current_date_dt.strftime("%Y-%m-%d"))
+        all_sessions_dfs.append(df_day_sessions)
+
+    if not all_sessions_dfs:
         print(f"\nNo data found for any day in {month_year_str}. Cannot generate monthly report.")
         # Create a minimal report indicating no data?
         md_filename = f"{month_year_str}-analytics.md"
@@ -329,16 +396,33 @@ def main():
         print(f"Days with data: {', '.join(processed_dates_for_log)}")
 
 
-    daily_summary_df = pd.DataFrame(daily_metrics_list)
-    all_sessions_combined_df = pd.concat(all_sessions_dfs, ignore_index=True) if all_sessions_dfs else pd.DataFrame()
+    # Derive the per-session columns once over the whole month rather than day by day.
+    # Every monthly aggregate is order-independent, so the spans are left in file order (no sort)
+    all_sessions_combined_df = pd.concat(all_sessions_dfs, ignore_index=True)
+    duration_seconds = (_epoch_ns(all_sessions_combined_df['last_timestamp_of_span']) - _epoch_ns(all_sessions_combined_df['first_timestamp'])) / 1e9
+    all_sessions_combined_df['duration_seconds'] = duration_seconds
+    all_sessions_combined_df['duration_minutes'] = duration_seconds / 60
+    all_sessions_combined_df['hour_of_day'] = _local_hours(all_sessions_combined_df['first_timestamp']).astype(np.int8) # 0-23, so int8 keeps the hourly bincounts cache-friendly
+
+    # Per-day rollup into month-length columns indexed by day, keeping only days with sessions
+    day_index = all_sessions_combined_df['day_index'].to_numpy()
+    session_counts = np.bincount(day_index, minlength=num_days_in_month)
+    total_duration_seconds = np.bincount(day_index, weights=duration_seconds, minlength=num_days_in_month)
+    has_data = session_counts > 0
+    daily_summary_df = pd.DataFrame({
+        'date': np.array(month_dates, dtype=object)[has_data], # datetime.date objects for easier plotting
+        'total_duration_hours': total_duration_seconds[has_data] / 3600,
+        'session_count': session_counts[has_data].astype(np.int32)
+    }, copy=False)
 
 
     # Generate Plots
     plot_paths = {}
-    plot_paths['daily_trends'] = plot_daily_trends(daily_summary_df, month_year_str, monthly_plots_output_dir)
+    report_fig = Figure() # One canvas, cleared and resized for each plot
+    plot_paths['daily_trends'] = plot_daily_trends(daily_summary_df, month_year_str, monthly_plots_output_dir, fig=report_fig)
     if not all_sessions_combined_df.empty:
-        plot_paths['session_duration_histogram'] = plot_session_duration_histogram(all_sessions_combined_df, month_year_str, monthly_plots_output_dir)
-        plot_paths['hourly_activity'] = plot_hourly_activity_barchart(all_sessions_combined_df, month_year_str, monthly_plots_output_dir)
+        plot_paths['session_duration_histogram'] = plot_session_duration_histogram(all_sessions_combined_df, month_year_str, monthly_plots_output_dir, fig=report_fig)
+        plot_paths['hourly_activity'] = plot_hourly_activity_barchart(all_sessions_combined_df, month_year_str, monthly_plots_output_dir, fig=report_fig)
     else: # Handle cases where all_sessions_combined_df might be empty even if daily_summary_df is not (e.g. all sessions were empty)
         print("Warning: Combined session data is empty, skipping session-specific plots.")
         plot_paths['session_duration_histogram'] = None
@@ -16,11 +16,22 @@ import os
 import sys
 import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import argparse
+import shutil
+import re
 from datetime import datetime, timedelta
+from functools import lru_cache
+try:
+    from itertools import pairwise
+except ImportError:  # Python < 3.10
+    def pairwise(iterable):
+        items = list(iterable)
+        return zip(items, items[1:])
 from pathlib import Path
 from dotenv import load_dotenv
-import time
+from concurrent.futures import ThreadPoolExecutor
 
 # Load environment variables
 env_path = Path(__file__).parent.parent / '.env'
@@ -36,6 +47,36 @@ API_URL = os.getenv("LIMITLESS_API_URL", "https://api.limitless.ai")
 MAX_DURATION_HOURS = 2
 MAX_DURATION_MS = MAX_DURATION_HOURS * 60 * 60 * 1000
 MIN_GAP_MINUTES = 30  # Minimum gap to consider a break between sessions
+DOWNLOAD_WORKERS = 4  # Chunks downloaded in parallel (downloads are network-bound)
+HTTP_POOL_SIZE = 8  # Keep-alive connections kept open per host
+
+# Parallel downloads can trip the API's rate limit, so rate-limit and transient server errors
+# are retried with jittered exponential backoff (honouring Retry-After) before a chunk fails
+DOWNLOAD_RETRY = Retry(
+    total=5,
+    backoff_factor=1,
+    backoff_jitter=1,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=["GET"],
+    respect_retry_after_header=True,
+    raise_on_status=False,  # Hand the final response back so the usual status handling reports it
+)
+
+# One HTTP session for the whole run, so chunk downloads reuse keep-alive connections
+# (one TCP/TLS handshake per pooled connection instead of per chunk)
+SESSION = requests.Session()
+for _prefix in ("https://", "http://"):
+    SESSION.mount(_prefix, HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=DOWNLOAD_RETRY))
+if API_KEY:
+    SESSION.headers.update({"X-API-Key": API_KEY})
+
+# Lifelog markdown timestamps like "11/19/25 7:03 AM", compiled once at import
+TIMESTAMP_PATTERN = re.compile(r'(\d{1,2}/\d{1,2}/\d{2}\s+\d{1,2}:\d{2}\s+[AP]M)')
+TIMESTAMP_FORMAT = "%m/%d/%y %I:%M %p"
+RECORDING_GAP = timedelta(minutes=5)  # A gap this long or longer starts a new recording period
+
+# datetime.fromisoformat only accepts a trailing "Z" (UTC) from Python 3.11 on
+FROMISOFORMAT_ACCEPTS_Z = sys.version_info >= (3, 11)
 
 
 def load_lifelog_data(date_str):
@@ -72,6 +113,34 @@ def load_lifelog_data(date_str):
     return None
 
 
+@lru_cache(maxsize=4096)
+def parse_markdown_timestamp(text):
+    """
+    Parse a markdown timestamp like "11/19/25 7:03 AM".
+
+    Cached because the same minute repeats on every speaker turn, and strptime is slow.
+
+    Returns:
+        datetime: Parsed (naive) timestamp, or None if the text is not a valid date
+    """
+    try:
+        return datetime.strptime(text, TIMESTAMP_FORMAT)
+    except ValueError:
+        return None
+
+
+def parse_iso_timestamp(text):
+    """
+    Parse an ISO 8601 timestamp from contents JSON, including a trailing "Z".
+
+    Returns:
+        datetime: Parsed timestamp (raises ValueError/TypeError if invalid)
+    """
+    if FROMISOFORMAT_ACCEPTS_Z or not text.endswith('Z'):
+        return datetime.fromisoformat(text)
+    return datetime.fromisoformat(text[:-1] + '+00:00')
+
+
 def extract_recording_periods(data):
     """
     Extract recording periods from lifelog data.
@@ -83,22 +152,17 @@ def extract_recording_periods(data):
     Returns:
         list: List of (start_time, end_time) tuples in datetime format
     """
-    import re
-
-    timestamps = []
+    timestamps = set()  # Deduplicated as they are collected
 
     # If data is a string (lifelog markdown)
     if isinstance(data, str):
         # Parse timestamps like: "11/19/25 7:03 AM" or "- Unknown (11/19/25 7:03 AM):"
-        pattern = r'(\d{1,2}/\d{1,2}/\d{2}\s+\d{1,2}:\d{2}\s+[AP]M)'
-        matches = re.findall(pattern, data)
+        matches = TIMESTAMP_PATTERN.findall(data)
 
         for match in matches:
-            try:
-                dt = datetime.strptime(match, "%m/%d/%y %I:%M %p")
-                timestamps.append(dt)
-            except:
-                pass
+            dt = parse_markdown_timestamp(match)
+            if dt is not None:
+                timestamps.add(dt)
 
     # If data is a list (contents JSON)
     elif isinstance(data, list):
@@ -110,14 +174,14 @@ def extract_recording_periods(data):
                 for item in contents:
                     if 'startTime' in item:
                         try:
-                            dt = datetime.fromisoformat(item['startTime'].replace('Z', '+00:00'))
-                            timestamps.append(dt)
+                            dt = parse_iso_timestamp(item['startTime'])
+                            timestamps.add(dt)
                         except:
                             pass
                     if 'endTime' in item:
                         try:
-                            dt = datetime.fromisoformat(item['endTime'].replace('Z', '+00:00'))
-                            timestamps.append(dt)
+                            dt = parse_iso_timestamp(item['endTime'])
+                            timestamps.add(dt)
                         except:
                             pass
 
@@ -125,40 +189,24 @@ def extract_recording_periods(data):
             if not timestamps:
                 markdown = lifelog.get('full_markdown', '')
                 if markdown:
-                    pattern = r'(\d{1,2}/\d{1,2}/\d{2}\s+\d{1,2}:\d{2}\s+[AP]M)'
-                    matches = re.findall(pattern, markdown)
+                    matches = TIMESTAMP_PATTERN.findall(markdown)
 
                     for match in matches:
-                        try:
-                            dt = datetime.strptime(match, "%m/%d/%y %I:%M %p")
-                            timestamps.append(dt)
-                        except:
-                            pass
+                        dt = parse_markdown_timestamp(match)
+                        if dt is not None:
+                            timestamps.add(dt)
 
     if not timestamps:
         return []
 
-    # Remove duplicates and sort
-    timestamps = sorted(set(timestamps))
+    # Sort (already deduplicated)
+    timestamps = sorted(timestamps)
 
-    # Group into continuous periods (find gaps)
-    periods = []
-    if timestamps:
-        current_start = timestamps[0]
-        current_end = timestamps[0]
-
-        for ts in timestamps[1:]:
-            # If gap is less than 5 minutes, extend current period
-            if (ts - current_end).total_seconds() < 300:
-                current_end = ts
-            else:
-                # Save current period and start new one
-                periods.append((current_start, current_end))
-                current_start = ts
-                current_end = ts
-
-        # Add the last period
-        periods.append((current_start, current_end))
+    # Split wherever consecutive timestamps are RECORDING_GAP or more apart
+    splits = [i for i, (prev, ts) in enumerate(pairwise(timestamps), 1)
+              if ts - prev >= RECORDING_GAP]
+    bounds = zip([0] + splits, splits + [len(timestamps)])
+    periods = [(timestamps[start], timestamps[stop - 1]) for start, stop in bounds]
 
     return periods
 
@@ -201,11 +249,10 @@ def chunk_periods_by_duration(periods, max_hours=MAX_DURATION_HOURS):
     """
     chunks = []
     chunk_index = 1
+    step = timedelta(hours=max_hours)  # Built once, reused for every chunk edge
 
     for start, end in periods:
-        duration_hours = (end - start).total_seconds() / 3600
-
-        if duration_hours <= max_hours:
+        if end - start <= step:
             # Period fits in one chunk
             label = get_time_label(start, chunk_index)
             chunks.append((start, end, label))
@@ -214,7 +261,7 @@ def chunk_periods_by_duration(periods, max_hours=MAX_DURATION_HOURS):
             # Split into multiple chunks
             current_start = start
             while current_start < end:
-                current_end = min(current_start + timedelta(hours=max_hours), end)
+                current_end = min(current_start + step, end)
                 label = get_time_label(current_start, chunk_index)
                 chunks.append((current_start, current_end, label))
                 current_start = current_end
@@ -266,47 +313,43 @@ def download_audio_chunk(start_dt, end_dt, output_path, verbose=True):
         "audioSource": "pendant"
     }
 
-    headers = {
-        "X-API-Key": API_KEY
-    }
+    # Chunks may download in parallel, so each one reports on a single line
+    duration_min = (end_dt - start_dt).total_seconds() / 60
+    progress = f"  {output_path.name}: {start_dt.strftime('%H:%M')} - {end_dt.strftime('%H:%M')} ({duration_min:.0f} min)..."
 
     try:
-        if verbose:
-            duration_min = (end_dt - start_dt).total_seconds() / 60
-            print(f"  Downloading: {start_dt.strftime('%H:%M')} - {end_dt.strftime('%H:%M')} ({duration_min:.0f} min)...", end=" ")
-
-        response = requests.get(
+        # Closing the response returns its connection to the session's pool
+        with SESSION.get(
             endpoint,
-            headers=headers,
             params=params,
             timeout=120,
             stream=True
-        )
-
-        if response.status_code == 200:
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-
-            with open(output_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-
-            file_size = output_path.stat().st_size
-            if verbose:
-                print(f"✅ {file_size/1024/1024:.1f} MB")
-
-            return True
-        elif response.status_code == 404:
-            if verbose:
-                print(f"⚠️  No audio (404)")
-            return False
-        else:
-            if verbose:
-                print(f"❌ Error {response.status_code}")
-            return False
+        ) as response:
+            if response.status_code == 200:
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+
+                # Copy the raw stream in 1 MiB blocks rather than iterating 8 KiB chunks in Python
+                response.raw.decode_content = True
+                with open(output_path, 'wb') as f:
+                    shutil.copyfileobj(response.raw, f, length=1024 * 1024)
+
+                file_size = output_path.stat().st_size
+                if verbose:
+                    print(f"{progress} ✅ {file_size/1024/1024:.1f} MB")
+
+                return True
+            elif response.status_code == 404:
+                if verbose:
+                    print(f"{progress} ⚠️  No audio (404)")
+                return False
+            else:
+                if verbose:
+                    print(f"{progress} ❌ Error {response.status_code}")
+                return False
 
     except Exception as e:
         if verbose:
-            print(f"❌ {e}")
+            print(f"{progress} ❌ {e}")
         return False
 
 
@@ -352,6 +395,12 @@ Examples:
         action="store_true",
         help="Show what would be downloaded without actually downloading"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DOWNLOAD_WORKERS,
+        help=f"Number of chunks to download in parallel (default: {DOWNLOAD_WORKERS})"
+    )
     parser.add_argument(
         "--quiet",
         action="store_true",
@@ -451,9 +500,8 @@ Examples:
     print(f"\n⬇️  Downloading audio...")
     print(f"{'='*60}\n")
 
-    success_count = 0
     skip_count = 0
-    error_count = 0
+    pending = []
 
     for i, (start, end, label) in enumerate(chunks, 1):
         filename = f"{date_str}-{label}-{start.strftime('%H%M')}.ogg"
@@ -466,19 +514,17 @@ Examples:
             skip_count += 1
             continue
 
-        if not args.quiet:
-            print(f"{i:2d}. {filename}")
+        pending.append((start, end, output_path))
 
-        success = download_audio_chunk(start, end, output_path, verbose=not args.quiet)
-
-        if success:
-            success_count += 1
-        else:
-            error_count += 1
+    # Downloads are network-bound, so overlap a few at a time instead of one by one
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        results = list(executor.map(
+            lambda job: download_audio_chunk(*job, verbose=not args.quiet),
+            pending
+        ))
 
-        # Brief delay between downloads
-        if i < len(chunks):
-            time.sleep(1)
+    success_count = sum(results)
+    error_count = len(results) - success_count
 
     # Summary
     print(f"\n{'='*60}")
@@ -20,11 +20,21 @@ import os
 import sys
 import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import argparse
+import shutil
 from datetime import datetime, timedelta
+from functools import lru_cache, partial
+try:
+    from itertools import pairwise
+except ImportError:  # Python < 3.10
+    def pairwise(iterable):
+        items = list(iterable)
+        return zip(items, items[1:])
 from pathlib import Path
 from dotenv import load_dotenv
-import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import re
 from calendar import monthrange
 
@@ -42,6 +52,33 @@ API_URL = os.getenv("LIMITLESS_API_URL", "https://api.limitless.ai")
 MAX_DURATION_HOURS = 2
 MAX_DURATION_MS = MAX_DURATION_HOURS * 60 * 60 * 1000
 MIN_GAP_MINUTES = 30
+DOWNLOAD_WORKERS = 4  # Chunks downloaded in parallel (downloads are network-bound)
+HTTP_POOL_SIZE = 8  # Keep-alive connections kept open per host
+
+# Parallel downloads can trip the API's rate limit, so rate-limit and transient server errors
+# are retried with jittered exponential backoff (honouring Retry-After) before a chunk fails
+DOWNLOAD_RETRY = Retry(
+    total=5,
+    backoff_factor=1,
+    backoff_jitter=1,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=["GET"],
+    respect_retry_after_header=True,
+    raise_on_status=False,  # Hand the final response back so the usual status handling reports it
+)
+
+# One HTTP session for the whole run, so chunk downloads reuse keep-alive connections
+# (one TCP/TLS handshake per pooled connection instead of per chunk)
+SESSION = requests.Session()
+for _prefix in ("https://", "http://"):
+    SESSION.mount(_prefix, HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=DOWNLOAD_RETRY))
+if API_KEY:
+    SESSION.headers.update({"X-API-Key": API_KEY})
+
+# Lifelog markdown timestamps like "11/19/25 7:03 AM", compiled once at import
+TIMESTAMP_PATTERN = re.compile(r'(\d{1,2}/\d{1,2}/\d{2}\s+\d{1,2}:\d{2}\s+[AP]M)')
+TIMESTAMP_FORMAT = "%m/%d/%y %I:%M %p"
+RECORDING_GAP = timedelta(minutes=5)  # A gap this long or longer starts a new recording period
 
 
 def load_lifelog_markdown(date_str):
@@ -58,6 +95,22 @@ def load_lifelog_markdown(date_str):
         return None
 
 
+@lru_cache(maxsize=4096)
+def parse_markdown_timestamp(text):
+    """
+    Parse a markdown timestamp like "11/19/25 7:03 AM".
+
+    Cached because the same minute repeats on every speaker turn, and strptime is slow.
+
+    Returns:
+        datetime: Parsed (naive) timestamp, or None if the text is not a valid date
+    """
+    try:
+        return datetime.strptime(text, TIMESTAMP_FORMAT)
+    except ValueError:
+        return None
+
+
 def extract_recording_periods(markdown_text):
     """
     Extract recording periods from lifelog markdown.
@@ -68,40 +121,27 @@ def extract_recording_periods(markdown_text):
     if not markdown_text:
         return []
 
-    timestamps = []
+    timestamps = set()  # Deduplicated as they are collected
 
     # Parse timestamps like: "11/19/25 7:03 AM"
-    pattern = r'(\d{1,2}/\d{1,2}/\d{2}\s+\d{1,2}:\d{2}\s+[AP]M)'
-    matches = re.findall(pattern, markdown_text)
+    matches = TIMESTAMP_PATTERN.findall(markdown_text)
 
     for match in matches:
-        try:
-            dt = datetime.strptime(match, "%m/%d/%y %I:%M %p")
-            timestamps.append(dt)
-        except:
-            pass
+        dt = parse_markdown_timestamp(match)
+        if dt is not None:
+            timestamps.add(dt)
 
     if not timestamps:
         return []
 
-    # Remove duplicates and sort
-    timestamps = sorted(set(timestamps))
-
-    # Group into continuous periods
-    periods = []
-    if timestamps:
-        current_start = timestamps[0]
-        current_end = timestamps[0]
+    # Sort (already deduplicated)
+    timestamps = sorted(timestamps)
 
-        for ts in timestamps[1:]:
-            if (ts - current_end).total_seconds() < 300:  # 5 min gap
-                current_end = ts
-            else:
-                periods.append((current_start, current_end))
-                current_start = ts
-                current_end = ts
-
-        periods.append((current_start, current_end))
+    # Split wherever consecutive timestamps are RECORDING_GAP or more apart
+    splits = [i for i, (prev, ts) in enumerate(pairwise(timestamps), 1)
+              if ts - prev >= RECORDING_GAP]
+    bounds = zip([0] + splits, splits + [len(timestamps)])
+    periods = [(timestamps[start], timestamps[stop - 1]) for start, stop in bounds]
 
     return periods
 
@@ -129,18 +169,17 @@ def chunk_periods_by_duration(periods, max_hours=MAX_DURATION_HOURS):
     """Split periods into chunks that don't exceed max_hours."""
     chunks = []
     chunk_index = 1
+    step = timedelta(hours=max_hours)  # Built once, reused for every chunk edge
 
     for start, end in periods:
-        duration_hours = (end - start).total_seconds() / 3600
-
-        if duration_hours <= max_hours:
+        if end - start <= step:
             label = get_time_label(start, chunk_index)
             chunks.append((start, end, label))
             chunk_index += 1
         else:
             current_start = start
             while current_start < end:
-                current_end = min(current_start + timedelta(hours=max_hours), end)
+                current_end = min(current_start + step, end)
                 label = get_time_label(current_start, chunk_index)
                 chunks.append((current_start, current_end, label))
                 current_start = current_end
@@ -177,38 +216,63 @@ def download_audio_chunk(start_dt, end_dt, output_path, verbose=True):
         "endMs": end_ms,
         "audioSource": "pendant"
     }
-    headers = {"X-API-Key": API_KEY}
 
     try:
-        response = requests.get(
+        # Closing the response returns its connection to the session's pool
+        with SESSION.get(
             endpoint,
-            headers=headers,
             params=params,
             timeout=120,
             stream=True
-        )
+        ) as response:
+            if response.status_code == 200:
+                output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        if response.status_code == 200:
-            output_path.parent.mkdir(parents=True, exist_ok=True)
+                # Copy the raw stream in 1 MiB blocks rather than iterating 8 KiB chunks in Python
+                response.raw.decode_content = True
+                with open(output_path, 'wb') as f:
+                    shutil.copyfileobj(response.raw, f, length=1024 * 1024)
 
-            with open(output_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-
-            return True
-        else:
-            return False
+                return True
+            else:
+                return False
 
     except Exception as e:
         return False
 
 
-def process_single_day(date_str, base_output_dir, dry_run=False, verbose=False):
+def download_and_report(start, end, output_path, verbose=False):
+    """
+    Download one chunk, printing a one-line result when verbose.
+
+    Chunks from different days may download in parallel, so each one reports on a single line tagged with its date.
+
+    Returns:
+        bool: True if successful
+    """
+    success = download_audio_chunk(start, end, output_path, verbose=False)
+
+    if verbose:
+        duration_min = (end - start).total_seconds() / 60
+        progress = f"    ⬇️  {output_path.parent.name} {start.strftime('%H:%M')}-{end.strftime('%H:%M')} ({duration_min:.0f}m)..."
+        # Newline written with the text in one call, so lines from parallel downloads don't run together
+        if success:
+            file_size = output_path.stat().st_size
+            print(f"{progress} ✅ {file_size/1024/1024:.1f}MB\n", end="")
+        else:
+            print(f"{progress} ❌\n", end="")
+
+    return success
+
+
+def plan_single_day(date_str, base_output_dir, dry_run=False):
     """
-    Process audio export for a single day.
+    Work out which audio chunks a single day needs, without downloading anything.
+
+    Pure local work (read + parse + merge + chunk + existence checks), so days can be planned in separate processes.
 
     Returns:
-        dict: Statistics about the export
+        dict: Statistics about the export, plus "pending" (start, end, output_path) jobs and "skipped_files"
     """
     # Load lifelog
     markdown = load_lifelog_markdown(date_str)
@@ -243,50 +307,52 @@ def process_single_day(date_str, base_output_dir, dry_run=False, verbose=False):
     year_month = date_obj.strftime("%Y-%m")
     day_dir = base_output_dir / year_month / date_str
 
-    stats = {
+    plan = {
         "date": date_str,
         "status": "success",
         "chunks": len(chunks),
         "downloaded": 0,
         "skipped": 0,
         "errors": 0,
-        "duration_hours": sum((end - start).total_seconds() for start, end, _ in chunks) / 3600
+        "duration_hours": sum((end - start).total_seconds() for start, end, _ in chunks) / 3600,
+        "pending": [],
+        "skipped_files": []
     }
 
     if dry_run:
-        return stats
+        return plan
 
-    # Download chunks
     for start, end, label in chunks:
         filename = f"{date_str}-{label}-{start.strftime('%H%M')}.ogg"
         output_path = day_dir / filename
 
         if output_path.exists():
-            stats["skipped"] += 1
-            if verbose:
-                print(f"    ⏭️  {filename}")
+            plan["skipped"] += 1
+            plan["skipped_files"].append(filename)
             continue
 
-        if verbose:
-            duration_min = (end - start).total_seconds() / 60
-            print(f"    ⬇️  {start.strftime('%H:%M')}-{end.strftime('%H:%M')} ({duration_min:.0f}m)...", end=" ")
+        plan["pending"].append((start, end, output_path))
 
-        success = download_audio_chunk(start, end, output_path, verbose=False)
+    return plan
 
-        if success:
-            stats["downloaded"] += 1
-            if verbose:
-                file_size = output_path.stat().st_size
-                print(f"✅ {file_size/1024/1024:.1f}MB")
-        else:
-            stats["errors"] += 1
-            if verbose:
-                print(f"❌")
 
-        # Brief delay between downloads
-        time.sleep(1)
+def download_planned(plans, workers=DOWNLOAD_WORKERS, verbose=False):
+    """
+    Download every pending chunk across all planned days through one thread pool.
+
+    Fills in each plan's "downloaded" and "errors" counts.
+    """
+    jobs = [(plan, job) for plan in plans for job in plan.get("pending", [])]
+
+    # Downloads are network-bound, so overlap them across days instead of one day at a time
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        results = list(executor.map(lambda item: download_and_report(*item[1], verbose=verbose), jobs))
 
-    return stats
+    for (plan, _), success in zip(jobs, results):
+        if success:
+            plan["downloaded"] += 1
+        else:
+            plan["errors"] += 1
 
 
 def generate_date_range(start_date, end_date):
@@ -338,6 +404,18 @@ Examples:
         action="store_true",
         help="Show what would be downloaded without downloading"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DOWNLOAD_WORKERS,
+        help=f"Number of chunks to download in parallel (default: {DOWNLOAD_WORKERS})"
+    )
+    parser.add_argument(
+        "--plan-workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of processes used to parse and plan days in parallel (default: number of CPU cores)"
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
@@ -392,11 +470,23 @@ Examples:
     days_no_lifelog = 0
     days_no_recordings = 0
 
-    for i, date_str in enumerate(dates, 1):
-        print(f"[{i}/{len(dates)}] {date_str}...", end=" ")
+    # Planning each day (parse + chunk) is CPU-bound and independent, so spread it over worker processes
+    plan_day = partial(plan_single_day, base_output_dir=base_output_dir, dry_run=args.dry_run)
+    plan_workers = min(args.plan_workers, len(dates))
+    if plan_workers > 1:
+        with ProcessPoolExecutor(max_workers=plan_workers) as executor:
+            all_stats = list(executor.map(plan_day, dates))
+    else:
+        all_stats = [plan_day(date_str) for date_str in dates]
+
+    # Then download the chunks of every day together, so network waits overlap across days
+    if not args.dry_run:
+        download_planned(all_stats, workers=args.workers, verbose=args.verbose)
+        if args.verbose:
+            print()
 
-        stats = process_single_day(date_str, base_output_dir, dry_run=args.dry_run, verbose=args.verbose)
-        all_stats.append(stats)
+    for i, stats in enumerate(all_stats, 1):
+        print(f"[{i}/{len(dates)}] {stats['date']}...", end=" ")
 
         if stats["status"] == "no_lifelog":
             print("⚠️  No lifelog")
@@ -412,9 +502,11 @@ Examples:
             total_duration += stats["duration_hours"]
             days_with_audio += 1
 
-            if not args.verbose:
-                print(f"✅ {stats['chunks']} chunks ({stats['duration_hours']:.1f}h) - "
-                      f"Downloaded: {stats['downloaded']}, Skipped: {stats['skipped']}")
+            print(f"✅ {stats['chunks']} chunks ({stats['duration_hours']:.1f}h) - "
+                  f"Downloaded: {stats['downloaded']}, Skipped: {stats['skipped']}")
+            if args.verbose and not args.dry_run:
+                for filename in stats["skipped_files"]:
+                    print(f"    ⏭️  {filename}")
 
     # Summary
     print(f"\n{'='*60}")